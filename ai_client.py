@@ -0,0 +1,199 @@
+"""HTTP client for the OpenAI chat completions API.
+
+Each worker process keeps one pooled keep-alive ``httpx.Client``. Every call
+runs against a total time budget; 429s, 5xx responses and transport errors
+are retried with jittered exponential backoff while budget remains, and a
+circuit breaker fails calls fast once the provider keeps failing.
+"""
+import json
+import os
+import random
+import threading
+import time
+
+import httpx
+
+
+class AIClientError(Exception):
+    pass
+
+
+class CircuitOpenError(AIClientError):
+    pass
+
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures.
+
+    While open, calls fail immediately. After ``reset_timeout`` seconds one
+    trial call is let through (half-open); its outcome closes or re-opens
+    the circuit.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == 'closed':
+                return
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = 'half-open'
+                return
+            raise CircuitOpenError('AI provider is unavailable, please try again shortly')
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half-open' or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+
+class AIClient:
+    def __init__(self, api_key, base_url='https://api.openai.com/v1', timeout=60,
+                 max_retries=3, backoff_base=0.5, backoff_max=8,
+                 max_connections=100, breaker=None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_connections)
+        self.breaker = breaker or CircuitBreaker()
+        self._client = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.counters = {'requests': 0, 'retries': 0, 'failures': 0, 'rejected': 0}
+
+    def _http(self):
+        # Created lazily so every gunicorn worker gets its own pool after fork
+        with self._lock:
+            if self._client is None or self._pid != os.getpid():
+                self._client = httpx.Client(
+                    base_url=self.base_url,
+                    headers={'Authorization': f'Bearer {self.api_key}'},
+                    limits=self.limits,
+                )
+                self._pid = os.getpid()
+            return self._client
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _backoff(self, attempt, response=None):
+        retry_after = response is not None and response.headers.get('Retry-After')
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        # Full jitter: spreads retries from many workers hitting the same 429
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _request(self, payload, timeout, stream):
+        """Send ``payload`` with retries; returns an open (possibly streaming) response."""
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self._count('rejected')
+            raise
+        deadline = time.monotonic() + (timeout or self.timeout)
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.breaker.record_failure()
+                self._count('failures')
+                raise AIClientError('AI request timed out')
+            self._count('requests')
+            response = error = None
+            try:
+                request = self._http().build_request(
+                    'POST', '/chat/completions', json=payload, timeout=httpx.Timeout(remaining)
+                )
+                response = self._http().send(request, stream=stream)
+                if response.status_code < 400:
+                    self.breaker.record_success()
+                    return response
+                if stream:
+                    response.read()
+                error = f'AI provider returned HTTP {response.status_code}'
+                retryable = response.status_code in RETRY_STATUSES
+                response.close()
+            except httpx.TimeoutException:
+                error, retryable = 'AI request timed out', True
+            except httpx.TransportError as e:
+                error, retryable = f'Could not reach AI provider: {e}', True
+            except httpx.HTTPError as e:
+                # Decoding errors, redirect loops and the like: no answer to retry
+                response, error, retryable = None, f'AI request failed: {e}', False
+            except Exception:
+                # Every call, including a half-open trial, must settle the breaker
+                self.breaker.record_failure()
+                self._count('failures')
+                raise
+            delay = self._backoff(attempt, response)
+            if not retryable or attempt >= self.max_retries or time.monotonic() + delay >= deadline:
+                if retryable or response is None:
+                    self.breaker.record_failure()
+                else:
+                    # A 4xx means the provider itself is answering
+                    self.breaker.record_success()
+                self._count('failures')
+                raise AIClientError(error)
+            attempt += 1
+            self._count('retries')
+            time.sleep(delay)
+
+    def chat(self, messages, model, timeout=None, **options):
+        """Return the assistant message (a dict) for a chat completion."""
+        payload = dict(options, model=model, messages=messages)
+        response = self._request(payload, timeout, stream=False)
+        try:
+            return response.json()['choices'][0]['message']
+        except (ValueError, KeyError, IndexError) as e:
+            raise AIClientError(f'Malformed AI response: {e}')
+
+    def stream_chat(self, messages, model, timeout=None, **options):
+        """Yield content chunks of a streamed chat completion."""
+        payload = dict(options, model=model, messages=messages, stream=True)
+        response = self._request(payload, timeout, stream=True)
+        try:
+            for line in response.iter_lines():
+                if not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    break
+                delta = json.loads(data)['choices'][0].get('delta', {})
+                if delta.get('content'):
+                    yield delta['content']
+        except httpx.HTTPError as e:
+            raise AIClientError(f'AI stream interrupted: {e}')
+        except (ValueError, KeyError, IndexError) as e:
+            raise AIClientError(f'Malformed AI stream chunk: {e}')
+        finally:
+            response.close()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        stats['circuit'] = self.breaker.state
+        return stats
@@ -1,8 +1,27 @@
-from flask import Flask, render_template, request, session, jsonify, redirect, url_for
+from flask import Flask, render_template, request, session, jsonify, redirect, url_for, Response, abort, stream_with_context, make_response
+import click
+import hmac
+import io
+import json
+import math
 import os
+import time
+from itertools import chain
 from dotenv import load_dotenv
-import openai
 from functools import wraps
+from werkzeug.datastructures import MultiDict
+import assets
+import session_store
+from cache import LRUCache, SQLiteCache, TieredCache, make_key
+from prefetch import Prefetcher
+from singleflight import SingleFlight, SingleFlightError, SQLiteLease
+from ai_client import AIClient, AIClientError, CircuitBreaker
+from engine import (BatchFormatError, DEFAULT_AMORTIZATION_MONTHS,
+                    DEFAULT_HORIZON_MONTHS, DISTRIBUTIONS, RAMPS, break_even, break_even_model,
+                    capacity_break_even, cash_flow_summary, cost_schedule, demand_curve,
+                    goal_seek_rows, heatmap_meta, heatmap_tile, mix_weights, monthly_fixed_costs,
+                    optimize_price, sales_mix_break_even, score_stream, simulate_break_even,
+                    staircase, tiered_break_even, tornado, weighted_unit)
 
 
 load_dotenv()
@@ -12,7 +31,71 @@ secret_key = os.getenv('FLASK_SECRET_KEY')
 if not secret_key:
     raise RuntimeError('FLASK_SECRET_KEY environment variable must be set')
 app.secret_key = secret_key
-openai.api_key = os.getenv('OPENAI_API_KEY')
+
+# Pooled keep-alive client per worker with retries and a circuit breaker
+ai_client = AIClient(
+    api_key=os.getenv('OPENAI_API_KEY'),
+    base_url=os.getenv('OPENAI_API_BASE', 'https://api.openai.com/v1'),
+    max_retries=int(os.getenv('AI_MAX_RETRIES', 3)),
+    max_connections=int(os.getenv('AI_MAX_CONNECTIONS', 100)),
+    breaker=CircuitBreaker(failure_threshold=int(os.getenv('AI_BREAKER_THRESHOLD', 5)),
+                           reset_timeout=int(os.getenv('AI_BREAKER_RESET', 30)))
+)
+
+AI_MODEL = "gpt-4"
+AI_SYSTEM_PROMPT = """You are a business analyst helping entrepreneurs estimate costs and metrics for their business."""
+# Bump whenever a step prompt template changes so stale answers aren't served
+AI_PROMPT_VERSION = 1
+# Total time budget (seconds, including retries) for each step's AI call
+AI_STEP_TIMEOUTS = {3: 30, 4: 30, 5: 30, 6: 45}
+AI_ESTIMATES_TIMEOUT = 60
+
+# Keep wizard data server-side; the cookie only carries a signed session ID
+session_backend = session_store.init_app(app)
+
+# Fingerprinted, precompressed static files (built by `flask assets build`)
+assets.init_app(app)
+
+# Two-tier cache for AI answers: per-worker LRU in front of a SQLite file
+# shared by all gunicorn workers on the host
+os.makedirs(app.instance_path, exist_ok=True)
+_ai_cache_ttl = int(os.getenv('AI_CACHE_TTL', 7 * 86400))
+ai_cache = TieredCache(
+    LRUCache(maxsize=int(os.getenv('AI_CACHE_MEMORY_ENTRIES', 512)), ttl=_ai_cache_ttl),
+    SQLiteCache(os.getenv('AI_CACHE_DB', os.path.join(app.instance_path, 'ai_cache.sqlite3')),
+                ttl=_ai_cache_ttl,
+                max_bytes=int(os.getenv('AI_CACHE_MAX_BYTES', 128 * 1024 * 1024)))
+)
+
+# Identical concurrent prompts share one OpenAI request, within a worker and
+# (through a SQLite lease) across the workers on this host
+ai_flight = SingleFlight(
+    SQLiteLease(os.getenv('AI_LEASE_DB', os.path.join(app.instance_path, 'ai_leases.sqlite3')))
+    if os.getenv('AI_COALESCE_WORKERS', '1') == '1' else None
+)
+
+# Memoized results of pure computations, keyed by a hash of their inputs
+analysis_cache = LRUCache(maxsize=int(os.getenv('ANALYSIS_CACHE_ENTRIES', 1024)))
+
+def memoized(fn, *args, **kwargs):
+    key = make_key(fn.__module__, fn.__name__, args, kwargs)
+    result = analysis_cache.get(key)
+    if result is None:
+        result = fn(*args, **kwargs)
+        analysis_cache.set(key, result)
+    return result
+
+# Rendered summary pages, keyed by a hash of the session's inputs and the
+# query string. Bump SUMMARY_VERSION whenever summary.html or one of its
+# analyses changes so stale pages aren't served
+SUMMARY_VERSION = 5
+summary_cache = LRUCache(maxsize=int(os.getenv('SUMMARY_CACHE_ENTRIES', 256)))
+
+# Background prefetch of the next step's AI suggestion (per worker)
+prefetcher = None
+if os.getenv('AI_PREFETCH', '1') == '1':
+    prefetcher = Prefetcher(max_workers=int(os.getenv('AI_PREFETCH_WORKERS', 4)),
+                            max_pending=int(os.getenv('AI_PREFETCH_MAX_PENDING', 16)))
 
 # Authentication decorator
 def requires_auth(f):
@@ -23,6 +106,19 @@ def requires_auth(f):
         return f(*args, **kwargs)
     return decorated
 
+# API routes answer 401 instead of redirecting, and also accept the access
+# code as a bearer token for scripted clients
+def requires_api_auth(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        access_code = os.environ.get('SECRET_KEY')
+        token = request.headers.get('Authorization', '')
+        if session.get('authenticated') or (
+                access_code and hmac.compare_digest(token, f"Bearer {access_code}")):
+            return f(*args, **kwargs)
+        return jsonify({'error': 'Authentication required'}), 401
+    return decorated
+
 # Login route
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -34,6 +130,25 @@ def login():
         return render_template('login.html', error='Invalid access code')
     return render_template('login.html')
 
+# Store metrics (hit rate, size) for capacity monitoring
+@app.route('/metrics')
+@requires_auth
+def metrics():
+    return jsonify({
+        'session_store': session_backend.stats() if session_backend else None,
+        'ai_cache': ai_cache.stats(),
+        'prefetch': prefetcher.stats() if prefetcher else None,
+        'ai_coalescing': ai_flight.stats(),
+        'ai_client': ai_client.stats(),
+        'analysis_cache': analysis_cache.stats(),
+        'summary_cache': summary_cache.stats()
+    })
+
+# Templates only wire up streaming when the suggestion can be saved server-side
+@app.context_processor
+def inject_ai_streaming():
+    return {'ai_streaming': session_backend is not None}
+
 # Initialize session data structure
 def init_session():
     if 'data' not in session:
@@ -48,20 +163,184 @@ def init_session():
             'marketing_budget': 0,
             'sales_volume': 0,
             'time_horizon': 0,
-            'ai_suggestions': {}
+            'growth_rate': 0,
+            'ramp_months': 0,
+            'ramp': 'linear',
+            'products': [],
+            'base_capacity': 0,
+            'max_capacity': 0,
+            'capacity_tiers': [],
+            'cogs_breaks': [],
+            'completed_steps': [],
+            'ai_suggestions': {},
+            'ai_estimates': {}
         }
         session.modified = True
 
+# Prompt templates for the AI-assisted steps
+def price_prompt(data):
+    return f"""Based on the following business details, what would be a good price point?
+    - Product/Service: {data['product_description']}
+    - Target Market: {data['target_audience']} in {data['location']}
+    
+    Consider:
+    - Target market's purchasing power
+    - Competitor pricing
+    - Perceived value
+    - Market positioning
+    
+    Provide analysis and end with FINAL SUGGESTION: $XX.XX"""
+
+def cogs_prompt(data):
+    return f"""Based on the following business details, what would be the cost of goods per unit?
+    - Product/Service: {data['product_description']}
+    - Target Market: {data['target_audience']} in {data['location']}
+    - Selling Price: ${data['price_range']}
+    
+    Consider:
+    - Material costs
+    - Labor costs
+    - Manufacturing/production costs
+    - Industry standard margins
+    
+    Provide analysis and end with FINAL SUGGESTION: $XX.XX"""
+
+def overhead_prompt(data):
+    return f"""Based on the following business details, what would be typical monthly overhead costs?
+    - Product/Service: {data['product_description']}
+    - Location: {data['location']}
+    - Price per Unit: ${data['price_range']}
+    - Cost per Unit: ${data['cost_of_goods']}
+    
+    Consider:
+    - Rent/lease costs in {data['location']}
+    - Utility costs
+    - Insurance
+    - Employee salaries
+    - Other fixed costs
+    
+    Provide analysis and end with FINAL SUGGESTION: $X,XXX.XX"""
+
+def startup_prompt(data):
+    return f"""Based on the following business details, what would be reasonable startup costs?
+    - Product/Service: {data['product_description']}
+    - Target Market: {data['target_audience']} in {data['location']}
+    - Price per Unit: ${data['price_range']}
+    - Cost per Unit: ${data['cost_of_goods']}
+    - Monthly Overhead: ${data['overhead_costs']}
+    
+    Consider and break down:
+    - Initial inventory needs
+    - Required equipment/facilities
+    - Legal and registration fees
+    - Initial marketing/launch costs
+    - Security deposits
+    - Working capital needs
+    
+    Provide detailed breakdown and end with FINAL SUGGESTION: $XX,XXX.XX"""
+
+def estimates_prompt(data):
+    return f"""Based on the following business details, estimate the unit economics of this business.
+    - Product/Service: {data['product_description']}
+    - Target Market: {data['target_audience']} in {data['location']}
+    
+    Provide, in US dollars:
+    - price_range: a good selling price per unit
+    - cost_of_goods: the cost of goods per unit at that price
+    - overhead_costs: typical monthly overhead costs
+    - startup_costs: reasonable one-time startup costs
+    
+    Keep the four numbers consistent with each other and give a short rationale for each."""
+
+ESTIMATE_FIELDS = ('price_range', 'cost_of_goods', 'overhead_costs', 'startup_costs')
+
+# Function-calling schema that forces the batched estimate into structured JSON
+ESTIMATES_FUNCTION = {
+    "name": "record_estimates",
+    "description": "Record the estimated unit economics for the business.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            field: {
+                "type": "object",
+                "properties": {
+                    "value": {"type": "number", "minimum": 0},
+                    "rationale": {"type": "string"}
+                },
+                "required": ["value", "rationale"]
+            }
+            for field in ESTIMATE_FIELDS
+        },
+        "required": list(ESTIMATE_FIELDS)
+    }
+}
+
+MAX_PRODUCTS = 500
+
+def products_prompt(data, products):
+    lines = "\n".join(
+        f"    - {p['name']}: price {'$%.2f' % p['price'] if p['price'] is not None else 'unknown'}, "
+        f"cost {'$%.2f' % p['cost'] if p['cost'] is not None else 'unknown'}"
+        for p in products
+    )
+    return f"""Based on the following business details, estimate the unit economics of each product it sells.
+    - Business: {data['product_description']}
+    - Target Market: {data['target_audience']} in {data['location']}
+    
+    Products:
+{lines}
+    
+    For every product, provide in US dollars a good selling price per unit and the cost of goods per unit,
+    keeping any price or cost that is already given. Give a one-sentence rationale for each product."""
+
+# Function-calling schema for suggesting every product's price and cost in one request
+PRODUCTS_FUNCTION = {
+    "name": "record_product_estimates",
+    "description": "Record the estimated price and unit cost of each product.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "products": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "name": {"type": "string"},
+                        "price": {"type": "number", "minimum": 0},
+                        "cost": {"type": "number", "minimum": 0},
+                        "rationale": {"type": "string"}
+                    },
+                    "required": ["name", "price", "cost", "rationale"]
+                }
+            }
+        },
+        "required": ["products"]
+    }
+}
+
+# Step number -> (field the AI estimates, field the step requires, prompt builder)
+AI_STEPS = {
+    3: ('price_range', 'target_audience', price_prompt),
+    4: ('cost_of_goods', 'price_range', cogs_prompt),
+    5: ('overhead_costs', 'cost_of_goods', overhead_prompt),
+    6: ('startup_costs', 'overhead_costs', startup_prompt),
+}
+
 # Apply the requires_auth decorator to all routes that need protection
 @app.route('/')
 @requires_auth
 def index():
+    reset_session()
+    return render_template('step1.html')
+
+def reset_session():
     # Preserve authentication status while clearing other session data
     auth_status = session.get('authenticated', False)
+    if prefetcher and getattr(session, 'sid', None):
+        prefetcher.discard(session.sid)
     session.clear()
     session['authenticated'] = auth_status
     init_session()
-    return render_template('step1.html')
 
 @app.route('/step1', methods=['GET', 'POST'])
 @requires_auth
@@ -96,7 +375,11 @@ def step2():
         
         session['data']['target_audience'] = target_audience
         session['data']['location'] = location
+        session['data']['ai_estimates'] = {}
+        if request.form.get('estimate_all'):
+            session['data']['ai_estimates'] = get_ai_estimates(session['data'])
         session.modified = True
+        prefetch_step(3)
         
         print(f"Debug - Step 2 - Current session data: {session['data']}")
         return redirect(url_for('step3'))
@@ -114,29 +397,159 @@ def step3():
     if request.method == 'POST':
         price = request.form.get('price_range')
         if not price:
-            prompt = f"""Based on the following business details, what would be a good price point?
-            - Product/Service: {session['data']['product_description']}
-            - Target Market: {session['data']['target_audience']} in {session['data']['location']}
-            
-            Consider:
-            - Target market's purchasing power
-            - Competitor pricing
-            - Perceived value
-            - Market positioning
+            prompt = price_prompt(session['data'])
             
-            Provide analysis and end with FINAL SUGGESTION: $XX.XX"""
-            
-            ai_suggestion = get_ai_suggestion(prompt)
+            try:
+                ai_suggestion = step_ai_suggestion(3, prompt)
+            except AIClientError as e:
+                return render_template('step3.html', error=f"Couldn't get an AI suggestion: {e}. Please enter a value.")
             session['data']['ai_suggestions']['price_range'] = ai_suggestion
             session.modified = True
             return render_template('step3.html', ai_suggestion=ai_suggestion)
         
         session['data']['price_range'] = float(price)
+        session['data']['products'] = []
         session.modified = True
+        prefetch_step(4)
         return redirect(url_for('step4'))
     
-    return render_template('step3.html')
+    return render_template('step3.html', **estimate_context(session['data'], 'price_range'))
+    
+# Parse the product rows of the mix form; blank prices and costs are None
+def parse_products(form):
+    products = []
+    rows = zip(form.getlist('name'), form.getlist('price'), form.getlist('cost'), form.getlist('mix'))
+    for name, price, cost, mix in rows:
+        name = name.strip()
+        if not (name or price or cost):
+            continue
+        if not name:
+            raise ValueError("Every product needs a name")
+        try:
+            products.append({
+                'name': name,
+                'price': float(price) if price else None,
+                'cost': float(cost) if cost else None,
+                'mix': max(float(mix), 0) if mix else 1.0,
+            })
+        except ValueError:
+            raise ValueError(f"Please enter valid numbers for {name}")
+    if not products:
+        raise ValueError("Please add at least one product")
+    if len(products) > MAX_PRODUCTS:
+        raise ValueError(f"At most {MAX_PRODUCTS} products are supported")
+    return products
+
+@app.route('/products', methods=['GET', 'POST'])
+@requires_auth
+def product_mix():
+    if 'data' not in session or not session['data'].get('target_audience'):
+        return redirect(url_for('step2'))
+    
+    if request.method == 'POST':
+        try:
+            products = parse_products(request.form)
+        except ValueError as e:
+            rows = zip(request.form.getlist('name'), request.form.getlist('price'),
+                       request.form.getlist('cost'), request.form.getlist('mix'))
+            return render_template('products.html', error=str(e), products=[
+                {'name': name, 'price': price, 'cost': cost, 'mix': mix} for name, price, cost, mix in rows
+            ])
+        
+        if any(p['price'] is None or p['cost'] is None for p in products):
+            # One request fills in every blank price and cost
+            estimates = get_ai_product_estimates(session['data'], products)
+            if not estimates:
+                return render_template('products.html', products=products,
+                                       error="Couldn't get AI suggestions. Please enter the missing prices and costs.")
+            for p in products:
+                estimate = estimates.get(p['name'].lower())
+                if estimate:
+                    p['price'] = estimate['price'] if p['price'] is None else p['price']
+                    p['cost'] = estimate['cost'] if p['cost'] is None else p['cost']
+                    p['rationale'] = estimate['rationale']
+            session['data']['ai_suggestions']['products'] = {
+                p['name']: p['rationale'] for p in products if p.get('rationale')
+            }
+            session.modified = True
+            return render_template('products.html', products=products, suggested=True)
+        
+        price, cost = weighted_unit([p['price'] for p in products], [p['cost'] for p in products],
+                                    [p['mix'] for p in products])
+        session['data']['products'] = products
+        session['data']['cogs_breaks'] = []
+        session['data']['price_range'] = round(float(price), 2)
+        session['data']['cost_of_goods'] = round(float(cost), 2)
+        session.modified = True
+        prefetch_step(5)
+        return redirect(url_for('step5'))
     
+    return render_template('products.html', products=session['data'].get('products') or [
+        {'name': session['data']['product_description'][:80], 'price': None, 'cost': None, 'mix': 1.0}
+    ])
+
+# Profit-maximizing price for a demand curve; costs not given in the request
+# come from the session (or the batched AI estimate of the unit cost)
+def price_optimization(data, params):
+    def number(name):
+        value = params.get(name)
+        if value in (None, ''):
+            return None
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'{name} must be a number')
+        if not math.isfinite(value):
+            raise ValueError(f'{name} must be a finite number')
+        return value
+    demand, max_price = demand_curve(params.get('model', 'linear'),
+                                     reference_price=number('reference_price'),
+                                     reference_volume=number('reference_volume'),
+                                     choke_price=number('choke_price'),
+                                     elasticity=number('elasticity'),
+                                     points=params.get('points'))
+    variable_cost = number('variable_cost')
+    if variable_cost is None:
+        estimate = data.get('ai_estimates', {}).get('cost_of_goods')
+        variable_cost = float(data.get('cost_of_goods') or (estimate['value'] if estimate else 0))
+    result = optimize_price(demand, max_price, variable_cost,
+                            float(data.get('overhead_costs') or 0) + float(data.get('marketing_budget') or 0),
+                            float(data.get('startup_costs') or 0))
+    if result['break_even_units'] == float('inf'):
+        result['break_even_units'] = None
+    return result
+
+@app.route('/api/optimize-price', methods=['POST'])
+@requires_api_auth
+def api_optimize_price():
+    params = request.get_json(force=True, silent=True)
+    if not isinstance(params, dict):
+        return jsonify({'error': 'Send the demand model as a JSON object'}), 400
+    try:
+        result = price_optimization(session.get('data', {}), params)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(result)
+
+# Volume discounts entered on step 4: unit cost from a volume threshold on
+def parse_cogs_breaks(form):
+    breaks = []
+    for units, cost in zip(form.getlist('discount_from'), form.getlist('discount_cost')):
+        if not units and not cost:
+            continue
+        try:
+            breaks.append({'from': float(units), 'cost': float(cost)})
+        except ValueError:
+            raise ValueError("Please enter both a volume and a unit cost for each discount")
+        if not (math.isfinite(breaks[-1]['from']) and math.isfinite(breaks[-1]['cost'])):
+            raise ValueError("Discount volumes and unit costs must be finite numbers")
+        if breaks[-1]['from'] <= 0 or breaks[-1]['cost'] < 0:
+            raise ValueError("Discount volumes must be positive and unit costs non-negative")
+    return sorted(breaks, key=lambda b: b['from'])
+
+def current_cost_schedule(data):
+    return cost_schedule(data['cost_of_goods'], [(b['from'], b['cost']) for b in data.get('cogs_breaks') or []])
+
 @app.route('/step4', methods=['GET', 'POST'])
 @requires_auth
 def step4():
@@ -146,29 +559,28 @@ def step4():
     if request.method == 'POST':
         cost = request.form.get('cost_of_goods')
         if not cost:
-            prompt = f"""Based on the following business details, what would be the cost of goods per unit?
-            - Product/Service: {session['data']['product_description']}
-            - Target Market: {session['data']['target_audience']} in {session['data']['location']}
-            - Selling Price: ${session['data']['price_range']}
+            prompt = cogs_prompt(session['data'])
             
-            Consider:
-            - Material costs
-            - Labor costs
-            - Manufacturing/production costs
-            - Industry standard margins
-            
-            Provide analysis and end with FINAL SUGGESTION: $XX.XX"""
-            
-            ai_suggestion = get_ai_suggestion(prompt)
+            try:
+                ai_suggestion = step_ai_suggestion(4, prompt)
+            except AIClientError as e:
+                return render_template('step4.html', error=f"Couldn't get an AI suggestion: {e}. Please enter a value.")
             session['data']['ai_suggestions']['cost_of_goods'] = ai_suggestion
             session.modified = True
             return render_template('step4.html', ai_suggestion=ai_suggestion)
         
+        try:
+            cogs_breaks = parse_cogs_breaks(request.form)
+        except ValueError as e:
+            return render_template('step4.html', error=str(e))
         session['data']['cost_of_goods'] = float(cost)
+        session['data']['cogs_breaks'] = cogs_breaks
+        session['data']['products'] = []
         session.modified = True
+        prefetch_step(5)
         return redirect(url_for('step5'))
     
-    return render_template('step4.html')
+    return render_template('step4.html', **estimate_context(session['data'], 'cost_of_goods'))
 
 @app.route('/step5', methods=['GET', 'POST'])
 @requires_auth
@@ -179,31 +591,320 @@ def step5():
     if request.method == 'POST':
         overhead = request.form.get('overhead_costs')
         if not overhead:
-            prompt = f"""Based on the following business details, what would be typical monthly overhead costs?
-            - Product/Service: {session['data']['product_description']}
-            - Location: {session['data']['location']}
-            - Price per Unit: ${session['data']['price_range']}
-            - Cost per Unit: ${session['data']['cost_of_goods']}
+            prompt = overhead_prompt(session['data'])
             
-            Consider:
-            - Rent/lease costs in {session['data']['location']}
-            - Utility costs
-            - Insurance
-            - Employee salaries
-            - Other fixed costs
-            
-            Provide analysis and end with FINAL SUGGESTION: $X,XXX.XX"""
-            
-            ai_suggestion = get_ai_suggestion(prompt)
+            try:
+                ai_suggestion = step_ai_suggestion(5, prompt)
+            except AIClientError as e:
+                return render_template('step5.html', error=f"Couldn't get an AI suggestion: {e}. Please enter a value.")
             session['data']['ai_suggestions']['overhead_costs'] = ai_suggestion
             session.modified = True
             return render_template('step5.html', ai_suggestion=ai_suggestion)
         
         session['data']['overhead_costs'] = float(overhead)
         session.modified = True
+        prefetch_step(6)
         return redirect(url_for('step6'))
     
-    return render_template('step5.html')
+    return render_template('step5.html', **estimate_context(session['data'], 'overhead_costs'))
+
+# (price, variable costs, monthly fixed costs, startup costs) from the session
+def break_even_inputs(data):
+    return (
+        float(data['price_range']),
+        float(data['cost_of_goods']),
+        float(data['overhead_costs']) + float(data.get('marketing_budget') or 0),
+        float(data['startup_costs'])
+    )
+
+# Break-even figures and chart model shared by step6, the summary page and
+# the what-if sliders; the browser draws the series from the model
+def break_even_analysis(data):
+    price, variable_costs, fixed_costs, startup_costs = break_even_inputs(data)
+    total_fixed_costs = monthly_fixed_costs(fixed_costs, startup_costs)
+    # Volume discounts make variable costs piecewise linear in units sold
+    schedule = current_cost_schedule(data) if data.get('cogs_breaks') else None
+    if schedule:
+        break_even_units = tiered_break_even(price, schedule, fixed_costs, startup_costs)
+    else:
+        break_even_units = break_even(price, variable_costs, fixed_costs, startup_costs)
+    
+    if break_even_units == float('inf'):
+        return {
+            'break_even_units': break_even_units,
+            'break_even_message': "Cannot calculate break-even point: Price per unit must be greater than variable costs per unit."
+                                  + (" (at your largest volume discount)" if schedule else ""),
+            'show_chart': False,
+            'chart_model': None,
+            'total_fixed_costs': total_fixed_costs
+        }
+    
+    return {
+        'break_even_units': break_even_units,
+        'break_even_message': f"You need to sell {break_even_units:.2f} units per month to break even (including startup costs amortized over 1 year"
+                              + (" and your volume discounts" if schedule else "") + ").",
+        'show_chart': True,
+        'chart_model': break_even_model(price, variable_costs, total_fixed_costs, break_even_units,
+                                        schedule),
+        'total_fixed_costs': total_fixed_costs
+    }
+
+# Plan fields set from the summary page's forms are kept in the session so
+# every card (and the next visit) sees the same numbers
+PLAN_FIELDS = {
+    'sales_volume': (0, None),
+    'marketing_budget': (0, None),
+    'time_horizon': (1, 120),
+    'growth_rate': (-50, 100),
+    'ramp_months': (0, 120),
+}
+
+def update_plan(data, args):
+    for field, (low, high) in PLAN_FIELDS.items():
+        value = args.get(field, type=float)
+        if value is not None:
+            value = max(value, low) if high is None else min(max(value, low), high)
+            data[field] = int(value) if field in ('time_horizon', 'ramp_months') else value
+            session.modified = True
+    if args.get('ramp') in RAMPS:
+        data['ramp'] = args['ramp']
+        session.modified = True
+
+# Monte Carlo bands around the entered values; options come from the
+# summary page's query string
+def uncertainty_analysis(data, args):
+    spread = min(max(args.get('spread', 20, type=float), 0), 100)
+    distribution = args.get('distribution', 'triangular')
+    if distribution not in DISTRIBUTIONS:
+        distribution = 'triangular'
+    simulation = simulate_break_even(*break_even_inputs(data),
+                                     spread=spread / 100,
+                                     distribution=distribution,
+                                     sales_volume=data.get('sales_volume') or None)
+    simulation['spread_percent'] = spread
+    return {'simulation': simulation}
+
+# What-if sliders on the summary page: update the inputs in the session and
+# return just the recomputed break-even and chart series
+WHAT_IF_FIELDS = ('price_range', 'cost_of_goods', 'overhead_costs', 'startup_costs')
+
+@app.route('/api/recompute', methods=['POST'])
+@requires_api_auth
+def api_recompute():
+    if 'data' not in session:
+        return jsonify({'error': 'Complete the wizard first'}), 409
+    changes = request.get_json(force=True, silent=True)
+    if not isinstance(changes, dict):
+        return jsonify({'error': 'Send the changed values as a JSON object'}), 400
+    try:
+        updates = {field: float(changes[field]) for field in WHAT_IF_FIELDS if field in changes}
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Values must be numbers'}), 400
+    if not all(math.isfinite(value) for value in updates.values()):
+        return jsonify({'error': 'Values must be finite numbers'}), 400
+    if any(value < 0 for value in updates.values()):
+        return jsonify({'error': 'Values must not be negative'}), 400
+    if updates:
+        session['data'].update(updates)
+        # Same as entering a single price or cost on step 3/4
+        if 'price_range' in updates or 'cost_of_goods' in updates:
+            session['data']['products'] = []
+        session.modified = True
+    analysis = break_even_analysis(session['data'])
+    units = analysis['break_even_units']
+    return jsonify({
+        'units': None if units == float('inf') else round(units, 2),
+        'message': analysis['break_even_message'],
+        'chart': analysis['chart_model']
+    })
+
+# Month-by-month cash flow over the planning horizon; needs an expected
+# sales volume
+def projection_analysis(data):
+    if not data.get('sales_volume'):
+        return {'projection': None}
+    projection = cash_flow_summary(*break_even_inputs(data),
+                                   sales_volume=float(data['sales_volume']),
+                                   months=int(data.get('time_horizon') or DEFAULT_HORIZON_MONTHS),
+                                   growth=float(data.get('growth_rate') or 0) / 100,
+                                   ramp_months=int(data.get('ramp_months') or 0),
+                                   ramp=data.get('ramp', 'linear'))
+    return {'projection': projection}
+
+# Per-product break-even units when the business sells a mix of products
+def sales_mix_analysis(data):
+    products = data.get('products')
+    if not products:
+        return {'sales_mix': None}
+    _, _, fixed_costs, startup_costs = break_even_inputs(data)
+    mix = [p['mix'] for p in products]
+    result = sales_mix_break_even([p['price'] for p in products], [p['cost'] for p in products],
+                                  mix, fixed_costs, startup_costs)
+    return {'sales_mix': {
+        'total_units': float(result['total_units']),
+        'weighted_margin': float(result['weighted_margin']),
+        'products': [
+            dict(p, share=share, units=units)
+            for p, share, units in zip(products, mix_weights(mix).tolist(), result['units'].tolist())
+        ]
+    }}
+
+# Goal seek: the session's value of every input not given in the request,
+# with the requested one solved for; lists solve a batch in one call
+GOAL_FIELDS = {
+    'price_range': 'price',
+    'cost_of_goods': 'variable_cost',
+    'overhead_costs': 'fixed_cost',
+    'startup_costs': 'startup',
+    'units': 'units',
+}
+MAX_GOAL_SEEK_ROWS = 10000
+
+def goal_seek_analysis(data, params):
+    goal = params.get('solve_for')
+    if goal not in GOAL_FIELDS:
+        raise ValueError(f"solve_for must be one of: {', '.join(GOAL_FIELDS)}")
+    defaults = {
+        'price_range': data.get('price_range') or None,
+        'cost_of_goods': data.get('cost_of_goods') or None,
+        'overhead_costs': data.get('overhead_costs') or None,
+        'startup_costs': data.get('startup_costs') or 0,
+        'units': data.get('sales_volume') or None,
+    }
+    inputs = {}
+    for field, name in GOAL_FIELDS.items():
+        if field == goal:
+            continue
+        value = params.get(field, defaults[field])
+        if value is None or value == '':
+            raise ValueError(f"Missing input: {field}")
+        inputs[name] = value
+    breaks = [(b['from'], b['cost']) for b in data.get('cogs_breaks') or []]
+    # Marketing stays a fixed cost of its own, so overhead_costs means the
+    # same as the step 5 field
+    marketing = float(params.get('marketing_budget', data.get('marketing_budget') or 0))
+    rows = goal_seek_rows(GOAL_FIELDS[goal], inputs, breaks=breaks, max_rows=MAX_GOAL_SEEK_ROWS,
+                          extra_fixed_cost=marketing)
+    fields = {name: field for field, name in GOAL_FIELDS.items()}
+    return {'solve_for': goal, 'results': [{fields.get(k, k): v for k, v in row.items()} for row in rows]}
+
+@app.route('/api/goal-seek', methods=['POST'])
+@requires_api_auth
+def api_goal_seek():
+    params = request.get_json(force=True, silent=True)
+    if not isinstance(params, dict):
+        return jsonify({'error': 'Send the goal and inputs as a JSON object'}), 400
+    try:
+        return jsonify(goal_seek_analysis(session.get('data', {}), params))
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+
+# Break-even points when overhead rises in steps with volume: the base
+# overhead covers base_capacity units, each extra tier adds capacity and cost
+def capacity_analysis(data):
+    if not data.get('base_capacity'):
+        return {'capacity_plan': None}
+    price, variable_costs, fixed_costs, startup_costs = break_even_inputs(data)
+    tiers = [(data['base_capacity'], fixed_costs)]
+    tiers += [(t['capacity'], t['cost']) for t in data.get('capacity_tiers', [])]
+    plan = capacity_break_even(price, variable_costs, tiers, data.get('max_capacity') or None, startup_costs)
+    plan['chart'] = staircase(price, variable_costs, plan['segments'])
+    return {'capacity_plan': plan}
+
+@app.route('/capacity', methods=['POST'])
+@requires_auth
+def capacity():
+    if 'data' not in session:
+        return redirect(url_for('step1'))
+    try:
+        base_capacity = float(request.form.get('base_capacity') or 0)
+        max_capacity = float(request.form.get('max_capacity') or 0)
+        tiers = [
+            {'capacity': float(units), 'cost': float(cost or 0)}
+            for units, cost in zip(request.form.getlist('tier_capacity'), request.form.getlist('tier_cost'))
+            if units
+        ]
+    except ValueError:
+        return redirect(url_for('summary', capacity_error=1, _anchor='capacity'))
+    if base_capacity < 0 or max_capacity < 0 or any(t['capacity'] <= 0 or t['cost'] < 0 for t in tiers):
+        return redirect(url_for('summary', capacity_error=1, _anchor='capacity'))
+    session['data']['base_capacity'] = base_capacity
+    session['data']['max_capacity'] = max_capacity
+    session['data']['capacity_tiers'] = tiers
+    session.modified = True
+    return redirect(url_for('summary', _anchor='capacity'))
+
+# Tornado data: break-even response to moving each input by up to ±perturbation
+def sensitivity_analysis(data, perturbation=0.1, steps=5):
+    return {'sensitivity': memoized(tornado, *break_even_inputs(data), perturbation=perturbation, steps=steps)}
+
+@app.route('/api/sensitivity')
+@requires_api_auth
+def api_sensitivity():
+    if 'data' not in session or not session['data'].get('overhead_costs'):
+        return jsonify({'error': 'Complete the wizard first'}), 409
+    perturbation = min(max(request.args.get('perturbation', 10, type=float), 0), 90) / 100
+    steps = min(max(request.args.get('steps', 5, type=int), 1), 50)
+    return jsonify(sensitivity_analysis(session['data'], perturbation, steps)['sensitivity'])
+
+# Price × cost heatmap: geometry first, then tiles fetched as the view moves.
+# Tile URLs embed a hash of the inputs, so a tile never changes and the
+# browser may cache it.
+def current_heatmap():
+    meta = memoized(heatmap_meta, *break_even_inputs(session['data']))
+    return meta, make_key(meta)
+
+@app.route('/api/heatmap')
+@requires_api_auth
+def api_heatmap():
+    if 'data' not in session or not session['data'].get('overhead_costs'):
+        return jsonify({'error': 'Complete the wizard first'}), 409
+    meta, key = current_heatmap()
+    return jsonify(dict(meta, tiles=f"{url_for('api_heatmap')}/{key}"))
+
+@app.route('/api/heatmap/<key>/<int(signed=True):tx>/<int(signed=True):ty>')
+@requires_api_auth
+def api_heatmap_tile(key, tx, ty):
+    if 'data' not in session or not session['data'].get('overhead_costs'):
+        return jsonify({'error': 'Complete the wizard first'}), 409
+    meta, current_key = current_heatmap()
+    if key != current_key:
+        return jsonify({'error': 'Inputs changed; reload the heatmap'}), 409
+    return Response(memoized(heatmap_tile, meta, tx, ty), mimetype='application/octet-stream',
+                    headers={'Cache-Control': 'private, max-age=86400'})
+
+@app.template_filter('units')
+def format_units(value):
+    return 'Never' if value == float('inf') else f"{value:,.0f}"
+
+@app.template_filter('dollars')
+def format_dollars(value):
+    return f"-${-value:,.0f}" if value < 0 else f"${value:,.0f}"
+
+def render_summary(data, args):
+    update_plan(data, args)
+    # Refreshes and back/forward visits with unchanged inputs reuse the
+    # rendered page, and browsers holding its ETag get a 304
+    key = make_key(SUMMARY_VERSION, data, sorted(args.items(multi=True)))
+    cached = summary_cache.get(key)
+    if cached is None:
+        body = render_template('summary.html', data=data,
+                               **break_even_analysis(data),
+                               **uncertainty_analysis(data, args),
+                               **sensitivity_analysis(data),
+                               **projection_analysis(data),
+                               **sales_mix_analysis(data),
+                               **capacity_analysis(data))
+        cached = (body, int(time.time()))
+        summary_cache.set(key, cached)
+    body, rendered = cached
+    response = make_response(body)
+    response.set_etag(key)
+    response.last_modified = rendered
+    # The page is per-user and must be revalidated on every view
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @app.route('/step6', methods=['GET', 'POST'])
 @requires_auth
@@ -214,117 +915,435 @@ def step6():
     if request.method == 'POST':
         startup_costs = request.form.get('startup_costs')
         if not startup_costs:
-            prompt = f"""Based on the following business details, what would be reasonable startup costs?
-            - Product/Service: {session['data']['product_description']}
-            - Target Market: {session['data']['target_audience']} in {session['data']['location']}
-            - Price per Unit: ${session['data']['price_range']}
-            - Cost per Unit: ${session['data']['cost_of_goods']}
-            - Monthly Overhead: ${session['data']['overhead_costs']}
-            
-            Consider and break down:
-            - Initial inventory needs
-            - Required equipment/facilities
-            - Legal and registration fees
-            - Initial marketing/launch costs
-            - Security deposits
-            - Working capital needs
-            
-            Provide detailed breakdown and end with FINAL SUGGESTION: $XX,XXX.XX"""
+            prompt = startup_prompt(session['data'])
             
-            ai_suggestion = get_ai_suggestion(prompt)
+            try:
+                ai_suggestion = step_ai_suggestion(6, prompt)
+            except AIClientError as e:
+                return render_template('step6.html', error=f"Couldn't get an AI suggestion: {e}. Please enter a value.")
             session['data']['ai_suggestions']['startup_costs'] = ai_suggestion
             session.modified = True
             return render_template('step6.html', ai_suggestion=ai_suggestion)
         
         session['data']['startup_costs'] = float(startup_costs)
+        complete_step(session['data'], 6)
         session.modified = True
         
-        # Calculate break-even point and prepare data for summary
-        data = session['data']
-        fixed_costs = float(data['overhead_costs'])
-        variable_costs = float(data['cost_of_goods'])
-        price = float(data['price_range'])
-        startup_costs = float(data['startup_costs'])
-        
-        try:
-            if price <= variable_costs:
-                break_even_units = float('inf')
-                break_even_message = "Cannot calculate break-even point: Price per unit must be greater than variable costs per unit."
-                show_chart = False
-            else:
-                # Calculate break-even including startup costs
-                contribution_margin = price - variable_costs
-                total_fixed_costs = fixed_costs + (startup_costs / 12)  # Amortize startup costs over 1 year
-                break_even_units = total_fixed_costs / contribution_margin
-                break_even_message = f"You need to sell {break_even_units:.2f} units per month to break even (including startup costs amortized over 1 year)."
-                show_chart = True
-        except Exception as e:
-            break_even_units = 0
-            break_even_message = f"Error calculating break-even point: {str(e)}"
-            show_chart = False
-        
-        # Generate data points for chart (0 to 2x break-even point)
-        if show_chart:
-            max_units = int(break_even_units * 2)
-            chart_data = {
-                'labels': [i * (max_units // 10) for i in range(11)],
-                'revenue': [(i * (max_units // 10)) * price for i in range(11)],
-                'costs': [(i * (max_units // 10)) * variable_costs + fixed_costs + (startup_costs / 12) for i in range(11)]
-            }
-        else:
-            chart_data = {'labels': [], 'revenue': [], 'costs': []}
-        
-        return render_template('summary.html',
-                             data=data,
-                             break_even_units=break_even_units,
-                             break_even_message=break_even_message,
-                             show_chart=show_chart,
-                             chart_data=chart_data)
+        return render_summary(session['data'], request.args)
     
-    return render_template('step6.html')
+    return render_template('step6.html', **estimate_context(session['data'], 'startup_costs'))
 
 @app.route('/summary')
 @requires_auth
 def summary():
-    data = session['data']
-    
-    # Calculate break-even point
-    fixed_costs = data['overhead_costs'] + data['marketing_budget']
-    variable_costs = data['cost_of_goods']
-    price = data['price_range']
-    
-    if price > variable_costs:
-        break_even_units = fixed_costs / (price - variable_costs)
-    else:
-        break_even_units = float('inf')
-    
-    # Generate data points for chart
-    chart_data = {
-        'labels': [i * 100 for i in range(11)],  # 0 to 1000 units
-        'revenue': [(i * 100) * price for i in range(11)],
-        'costs': [(i * 100) * variable_costs + fixed_costs for i in range(11)]
+    if 'data' not in session:
+        return redirect(url_for('step1'))
+    return render_summary(session['data'], request.args)
+
+# Single-page wizard: a versioned JSON API over the same session data as
+# the step pages. Each step PATCHes only the fields that changed, and
+# validation errors come back per field with a 422.
+WIZARD_API_VERSION = 1
+# Step number -> (fields it sets, field an earlier step must have set)
+WIZARD_STEPS = {
+    1: (('product_description',), None),
+    2: (('target_audience', 'location'), 'product_description'),
+    3: (('price_range',), 'target_audience'),
+    4: (('cost_of_goods', 'cogs_breaks'), 'price_range'),
+    5: (('overhead_costs',), 'cost_of_goods'),
+    6: (('startup_costs',), 'overhead_costs'),
+}
+WIZARD_TEXT_FIELDS = ('product_description', 'target_audience', 'location')
+WIZARD_OPTIONAL_FIELDS = ('cogs_breaks',)
+
+def step_complete(data, step):
+    # A step is done once its main field is set, the same test the step pages
+    # use to redirect back, or once it has been submitted: zero startup costs
+    # are valid but look the same as the unset default
+    return step in data.get('completed_steps', ()) or bool(data.get(WIZARD_STEPS[step][0][0]))
+
+def complete_step(data, step):
+    if step not in data.setdefault('completed_steps', []):
+        data['completed_steps'].append(step)
+
+def wizard_state(data):
+    # The current step is the first one that isn't complete yet
+    current = next((step for step in WIZARD_STEPS if not step_complete(data, step)), None)
+    return {
+        'version': WIZARD_API_VERSION,
+        'step': current,
+        'complete': current is None,
+        'data': {field: data.get(field) for fields, _ in WIZARD_STEPS.values() for field in fields},
+        'estimates': data.get('ai_estimates') or {},
+        'summary_url': url_for('summary'),
     }
-    
-    return render_template('summary.html', 
-                         data=data, 
-                         break_even_units=break_even_units,
-                         chart_data=chart_data)
 
-def get_ai_suggestion(prompt):
+def validate_step(step, changes):
+    fields = WIZARD_STEPS[step][0]
+    updates, errors = {}, {}
+    for field, value in changes.items():
+        if field not in fields:
+            errors[field] = f"Not a field of step {step}"
+        elif value in ('', None) and field not in WIZARD_OPTIONAL_FIELDS:
+            errors[field] = "Please fill in this field"
+        elif field in WIZARD_TEXT_FIELDS:
+            if not isinstance(value, str) or not value.strip():
+                errors[field] = "Please fill in this field"
+            else:
+                updates[field] = value.strip()
+        elif field == 'cogs_breaks':
+            try:
+                form = MultiDict([(key, '' if b.get(name) is None else str(b.get(name)))
+                                  for b in value for key, name in (('discount_from', 'from'), ('discount_cost', 'cost'))])
+                updates[field] = parse_cogs_breaks(form)
+            except (TypeError, AttributeError):
+                errors[field] = "Discounts must be a list of {from, cost} objects"
+            except ValueError as e:
+                errors[field] = str(e)
+        else:
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                errors[field] = "Please enter a number"
+                continue
+            if not math.isfinite(number):
+                errors[field] = "Please enter a finite number"
+                continue
+            # Later steps need a non-zero price, cost and overhead
+            if field == 'startup_costs' and number < 0:
+                errors[field] = "Must not be negative"
+            elif field != 'startup_costs' and number <= 0:
+                errors[field] = "Must be greater than zero"
+            else:
+                updates[field] = number
+    return updates, errors
+
+# Same side effects as submitting the step page
+def apply_step(step, updates, estimate_all=False):
+    data = session['data']
+    data.update(updates)
+    complete_step(data, step)
+    if step == 2 and (updates or estimate_all):
+        data['ai_estimates'] = get_ai_estimates(data) if estimate_all else {}
+    if 'price_range' in updates or 'cost_of_goods' in updates:
+        data['products'] = []
+    session.modified = True
+    if step + 1 in AI_STEPS:
+        prefetch_step(step + 1)
+
+@app.route('/wizard')
+@requires_auth
+def wizard():
+    init_session()
+    return render_template('wizard.html', state=wizard_state(session['data']))
+
+@app.route('/api/v1/session', methods=['GET', 'DELETE'])
+@requires_api_auth
+def api_session():
+    if request.method == 'DELETE':
+        reset_session()
+    init_session()
+    return jsonify(wizard_state(session['data']))
+
+@app.route('/api/v1/steps/<int:step>', methods=['GET', 'PATCH'])
+@requires_api_auth
+def api_step(step):
+    if step not in WIZARD_STEPS:
+        return jsonify({'error': f'Unknown step: {step}'}), 404
+    init_session()
+    data = session['data']
+    fields, required = WIZARD_STEPS[step]
+    if required and not data.get(required):
+        return jsonify({'error': 'Complete the earlier steps first', 'step': wizard_state(data)['step']}), 409
+
+    if request.method == 'GET':
+        field = fields[0]
+        return jsonify({
+            'version': WIZARD_API_VERSION,
+            'step': step,
+            'data': {f: data.get(f) for f in fields},
+            'suggestion': data['ai_suggestions'].get(field) or estimated_suggestion(data, field),
+            'stream_url': url_for('stream_suggestion', step=step)
+                          if step in AI_STEPS and session_backend is not None else None,
+        })
+
+    changes = request.get_json(force=True, silent=True)
+    if not isinstance(changes, dict):
+        return jsonify({'error': 'Send the changed fields as a JSON object'}), 400
+    estimate_all = bool(changes.pop('estimate_all', False)) if step == 2 else False
+    updates, errors = validate_step(step, changes)
+    for field in fields:
+        if field not in updates and field not in errors and field not in WIZARD_OPTIONAL_FIELDS \
+                and not data.get(field) and not (field == fields[0] and step_complete(data, step)):
+            errors[field] = "Please fill in this field"
+    if errors:
+        return jsonify({'version': WIZARD_API_VERSION, 'errors': errors}), 422
+    apply_step(step, updates, estimate_all)
+    return jsonify(dict(wizard_state(data), updated=sorted(updates)))
+
+def batch_format(name, mimetype):
+    if name:
+        return name
+    return 'ndjson' if 'json' in (mimetype or '') else 'csv'
+
+# Score CSV/NDJSON rows of price, COGS, overhead and startup costs; input is
+# read and results are streamed back chunk by chunk
+@app.route('/api/batch', methods=['POST'])
+@requires_api_auth
+def api_batch():
+    fmt = batch_format(request.args.get('format'), request.mimetype)
+    months = request.args.get('amortization_months', DEFAULT_AMORTIZATION_MONTHS, type=float)
+    lines = io.TextIOWrapper(request.stream, encoding='utf-8', newline='')
     try:
-        print(f"Debug - Sending prompt to OpenAI: {prompt}")  # Debug print
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": """You are a business analyst helping entrepreneurs estimate costs and metrics for their business."""},
-                {"role": "user", "content": prompt}
-            ]
+        chunks = score_stream(lines, fmt, months)
+        # Pull the first chunk now so header errors become a 400
+        first = next(chunks, '')
+    except BatchFormatError as e:
+        return jsonify({'error': str(e)}), 400
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    return Response(stream_with_context(chain([first], chunks)), mimetype=mimetype)
+
+@app.cli.command('batch')
+@click.argument('source', type=click.File('r', lazy=False), default='-')
+@click.option('--output', '-o', type=click.File('w'), default='-', help='Output file (default stdout).')
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']),
+              help='Input format; guessed from the file extension if omitted.')
+@click.option('--amortization-months', default=DEFAULT_AMORTIZATION_MONTHS, type=float,
+              help='Months over which startup costs are amortized.')
+def batch_command(source, output, fmt, amortization_months):
+    """Score CSV or NDJSON rows of price/COGS/overhead/startup costs."""
+    if not fmt:
+        fmt = 'ndjson' if source.name.endswith(('.ndjson', '.jsonl')) else 'csv'
+    try:
+        for chunk in score_stream(source, fmt, amortization_months):
+            output.write(chunk)
+    except BatchFormatError as e:
+        raise click.ClickException(str(e))
+
+@app.cli.group('assets')
+def assets_command():
+    """Vendor, fingerprint and precompress static assets."""
+
+@assets_command.command('vendor')
+def assets_vendor_command():
+    """Download the pinned third-party libraries into static/vendor."""
+    try:
+        for name, size in assets.vendor(app.static_folder):
+            click.echo(f"{name}: {size:,} bytes")
+    except OSError as e:
+        raise click.ClickException(f"Couldn't download vendored assets: {e}")
+
+@assets_command.command('build')
+def assets_build_command():
+    """Write fingerprinted, gzip/brotli-compressed copies to static/dist."""
+    try:
+        manifest = assets.build(app.static_folder)
+    except FileNotFoundError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Built {len(manifest)} assets" + ("" if assets.brotli else " (install brotli for .br variants)"))
+
+# One structured request for all four numbers, used by the optional
+# "estimate everything" mode of step 2
+def get_ai_estimates(data):
+    prompt = estimates_prompt(data)
+    key = ai_cache_key(json.dumps(ESTIMATES_FUNCTION) + prompt)
+    cached = ai_cache.get(key)
+    if cached is not None:
+        print(f"Debug - AI cache hit for {key[:12]}")
+        return cached
+    try:
+        print(f"Debug - Sending estimates prompt to OpenAI: {prompt}")  # Debug print
+        message = ai_client.chat(
+            ai_messages(prompt),
+            model=AI_MODEL,
+            timeout=AI_ESTIMATES_TIMEOUT,
+            functions=[ESTIMATES_FUNCTION],
+            function_call={"name": ESTIMATES_FUNCTION["name"]}
         )
-        print(f"Debug - Received response from OpenAI: {response}")  # Debug print
-        return response.choices[0].message.content
-    except Exception as e:
-        print(f"Error in get_ai_suggestion: {str(e)}")  # Debug print
-        return f"Error: {str(e)}"
+        arguments = json.loads(message['function_call']['arguments'])
+        estimates = {
+            field: {
+                'value': round(float(arguments[field]['value']), 2),
+                'rationale': str(arguments[field]['rationale'])
+            }
+            for field in ESTIMATE_FIELDS
+        }
+    except (AIClientError, ValueError, KeyError, TypeError) as e:
+        # Failed call or malformed arguments: steps fall back to their own per-field prompts
+        print(f"Error in get_ai_estimates: {str(e)}")  # Debug print
+        return {}
+    ai_cache.set(key, estimates)
+    return estimates
+
+def get_ai_product_estimates(data, products):
+    prompt = products_prompt(data, products)
+    key = ai_cache_key(json.dumps(PRODUCTS_FUNCTION) + prompt)
+    cached = ai_cache.get(key)
+    if cached is not None:
+        print(f"Debug - AI cache hit for {key[:12]}")
+        return cached
+    try:
+        print(f"Debug - Sending products prompt to OpenAI: {prompt}")  # Debug print
+        message = ai_client.chat(
+            ai_messages(prompt),
+            model=AI_MODEL,
+            timeout=AI_ESTIMATES_TIMEOUT,
+            functions=[PRODUCTS_FUNCTION],
+            function_call={"name": PRODUCTS_FUNCTION["name"]}
+        )
+        arguments = json.loads(message['function_call']['arguments'])
+        # Keyed by lower-cased name; the model may not keep the order
+        estimates = {
+            str(item['name']).strip().lower(): {
+                'price': round(float(item['price']), 2),
+                'cost': round(float(item['cost']), 2),
+                'rationale': str(item['rationale'])
+            }
+            for item in arguments['products']
+        }
+    except (AIClientError, ValueError, KeyError, TypeError) as e:
+        # Failed call or malformed arguments: the missing numbers are entered by hand
+        print(f"Error in get_ai_product_estimates: {str(e)}")  # Debug print
+        return {}
+    ai_cache.set(key, estimates)
+    return estimates
+
+def estimated_suggestion(data, field):
+    estimate = data.get('ai_estimates', {}).get(field)
+    if not estimate:
+        return None
+    # Same closing line as the per-step prompts so useSuggestion() can parse it
+    return f"{estimate['rationale']}\n\nFINAL SUGGESTION: ${estimate['value']:,.2f}"
+
+def estimate_context(data, field):
+    suggestion = estimated_suggestion(data, field)
+    if not suggestion:
+        return {}
+    return {'ai_suggestion': suggestion, 'prefill': data['ai_estimates'][field]['value']}
+
+# Start the AI call for `step` in the background once its inputs are known
+def prefetch_step(step):
+    sid = getattr(session, 'sid', None)
+    field, required, build_prompt = AI_STEPS[step]
+    if not prefetcher or not sid or estimated_suggestion(session['data'], field):
+        return
+    prompt = build_prompt(session['data'])
+    prefetcher.submit(sid, step, ai_cache_key(prompt), get_ai_suggestion, prompt, AI_STEP_TIMEOUTS[step])
+
+# Suggestion for a blank step submit: batched estimate, then prefetched
+# result, then a fresh call
+def step_ai_suggestion(step, prompt):
+    field = AI_STEPS[step][0]
+    suggestion = estimated_suggestion(session['data'], field)
+    if not suggestion and prefetcher and getattr(session, 'sid', None):
+        suggestion = prefetcher.wait(session.sid, step, ai_cache_key(prompt))
+    return suggestion or get_ai_suggestion(prompt, timeout=AI_STEP_TIMEOUTS[step])
+
+def sse_event(payload, event=None):
+    message = f"event: {event}\n" if event else ''
+    return message + f"data: {json.dumps(payload)}\n\n"
+
+# Server-Sent Events variant of the blank-field POST on steps 3-6: tokens are
+# pushed as they arrive and the finished text is saved to the session store
+@app.route('/step<int:step>/stream')
+@requires_auth
+def stream_suggestion(step):
+    if step not in AI_STEPS or session_backend is None:
+        abort(404)
+    field, required, build_prompt = AI_STEPS[step]
+    if 'data' not in session or not session['data'].get(required):
+        abort(409)
+    prompt = build_prompt(session['data'])
+    sid = session.sid
+
+    def generate():
+        parts = []
+        try:
+            # An in-flight prefetch finishes sooner than a fresh call would
+            ready = estimated_suggestion(session['data'], field)
+            if not ready and prefetcher:
+                ready = prefetcher.wait(sid, step, ai_cache_key(prompt))
+            for text in [ready] if ready else get_ai_suggestion(prompt, AI_STEP_TIMEOUTS[step], stream=True):
+                parts.append(text)
+                yield sse_event({'text': text})
+        except AIClientError as e:
+            print(f"Error in stream_suggestion: {str(e)}")  # Debug print
+            yield sse_event({'error': f"Couldn't get an AI suggestion: {e}. Please enter a value."}, event='error')
+            return
+        suggestion = ''.join(parts)
+        # The response (and session cookie) went out before the stream
+        # started, so write straight to the backend
+        stored = session_backend.get(sid)
+        if stored is not None and 'data' in stored:
+            stored['data']['ai_suggestions'][field] = suggestion
+            session_backend.set(sid, stored)
+        yield sse_event({'text': suggestion}, event='done')
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def normalize_prompt(prompt):
+    # Collapse the indentation/whitespace of the triple-quoted templates so
+    # cosmetic edits don't change the cache key
+    return ' '.join(prompt.split())
+
+def ai_cache_key(prompt):
+    return make_key(AI_PROMPT_VERSION, AI_MODEL, AI_SYSTEM_PROMPT, normalize_prompt(prompt))
+
+def ai_messages(prompt):
+    return [
+        {"role": "system", "content": AI_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+# Returns the suggestion text, or an iterator of text chunks when stream=True.
+# Raises AIClientError when no suggestion could be produced.
+def get_ai_suggestion(prompt, timeout=None, stream=False):
+    key = ai_cache_key(prompt)
+    cached = ai_cache.get(key)
+    if cached is not None:
+        print(f"Debug - AI cache hit for {key[:12]}")
+        return iter([cached]) if stream else cached
+    if stream:
+        return _coalesced_stream(prompt, key, timeout)
+    try:
+        return ai_flight.do(key, _request_ai_suggestion, prompt, key, timeout, timeout=timeout)
+    except SingleFlightError as e:
+        # Failure of the same call made by another worker
+        raise AIClientError(str(e))
+
+def _request_ai_suggestion(prompt, key, timeout):
+    # Another flight may have finished between our cache miss and winning the lease
+    cached = ai_cache.get(key)
+    if cached is not None:
+        return cached
+    print(f"Debug - Sending prompt to OpenAI: {prompt}")  # Debug print
+    message = ai_client.chat(ai_messages(prompt), model=AI_MODEL, timeout=timeout)
+    print(f"Debug - Received response from OpenAI: {message}")  # Debug print
+    suggestion = message['content']
+    # Only successful answers are cached; errors are retried on the next submit
+    ai_cache.set(key, suggestion)
+    return suggestion
+
+# Only the leader streams from OpenAI; concurrent callers with the same
+# prompt, streamed or not, get its finished text in one chunk
+def _coalesced_stream(prompt, key, timeout):
+    try:
+        yield from ai_flight.stream(key, _stream_ai_suggestion, prompt, key, timeout, timeout=timeout)
+    except SingleFlightError as e:
+        raise AIClientError(str(e))
+
+def _stream_ai_suggestion(prompt, key, timeout):
+    cached = ai_cache.get(key)
+    if cached is not None:
+        yield cached
+        return
+    print(f"Debug - Streaming prompt to OpenAI: {prompt}")  # Debug print
+    parts = []
+    for text in ai_client.stream_chat(ai_messages(prompt), model=AI_MODEL, timeout=timeout):
+        parts.append(text)
+        yield text
+    ai_cache.set(key, ''.join(parts))
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,123 @@
+"""Static asset pipeline.
+
+Third-party libraries are pinned in ``VENDOR`` and fetched once into
+``static/vendor`` (``flask assets vendor``), so pages need no CDN.
+``flask assets build`` copies every static file to ``static/dist`` under a
+content-hashed name, next to gzip and (with the optional ``brotli``
+package) brotli variants, and writes a manifest; it refuses to run until
+the libraries are vendored, so a build never depends on a CDN. Templates link assets
+with ``asset_url(name)``; built files are served from ``/assets`` with a
+year-long ``immutable`` lifetime and the smallest encoding the browser
+accepts. Without a build, ``asset_url`` falls back to the plain static
+URL, or to the pinned CDN URL for a library that hasn't been vendored.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import urllib.request
+
+from flask import request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # brotli variants are only written when it's installed
+    brotli = None
+
+VENDOR = {
+    'vendor/bootstrap.min.css': 'https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css',
+    'vendor/chart.umd.js': 'https://cdn.jsdelivr.net/npm/chart.js@4.4.1/dist/chart.umd.js',
+}
+COMPRESSIBLE = ('.css', '.js', '.json', '.svg', '.txt')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+MANIFEST = 'manifest.json'
+
+
+def vendor(static_folder):
+    """Download the pinned ``VENDOR`` files into the static folder."""
+    for name, url in VENDOR.items():
+        path = os.path.join(static_folder, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with urllib.request.urlopen(url, timeout=30) as response:
+            content = response.read()
+        with open(path, 'wb') as f:
+            f.write(content)
+        yield name, len(content)
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def build(static_folder):
+    """Fingerprint and precompress every static file; return the manifest.
+
+    Raises ``FileNotFoundError`` if any ``VENDOR`` file is missing. Files
+    from earlier builds are left in place, so pages rendered before a
+    deploy can still load the assets they reference.
+    """
+    missing = [name for name in VENDOR if not os.path.isfile(os.path.join(static_folder, name))]
+    if missing:
+        raise FileNotFoundError(f"Not vendored: {', '.join(missing)}; run 'flask assets vendor' first")
+    dist = os.path.join(static_folder, 'dist')
+    manifest = {}
+    for root, dirs, files in os.walk(static_folder):
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != dist)
+        for filename in sorted(files):
+            path = os.path.join(root, filename)
+            name = os.path.relpath(path, static_folder).replace(os.sep, '/')
+            with open(path, 'rb') as f:
+                content = f.read()
+            stem, ext = os.path.splitext(name)
+            hashed = f'{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}'
+            target = os.path.join(dist, hashed)
+            _write(target, content)
+            if ext in COMPRESSIBLE:
+                _write(target + '.gz', gzip.compress(content, 9, mtime=0))
+                if brotli is not None:
+                    _write(target + '.br', brotli.compress(content))
+            manifest[name] = hashed
+    _write(os.path.join(dist, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest
+
+
+def _load_manifest(dist):
+    try:
+        with open(os.path.join(dist, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def init_app(app):
+    """Register the ``/assets`` route and the ``asset_url`` template global."""
+    dist = os.path.join(app.static_folder, 'dist')
+    manifest = _load_manifest(dist)
+
+    @app.route('/assets/<path:filename>')
+    def assets(filename):
+        path = os.path.join(dist, filename)
+        suffix = ''
+        for encoding, candidate in (('br', '.br'), ('gzip', '.gz')):
+            if request.accept_encodings[encoding] and os.path.isfile(path + candidate):
+                suffix = candidate
+                break
+        response = send_from_directory(dist, filename + suffix, mimetype=mimetypes.guess_type(filename)[0])
+        if suffix:
+            response.content_encoding = encoding
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = IMMUTABLE
+        return response
+
+    @app.template_global()
+    def asset_url(name):
+        if name in manifest:
+            return url_for('assets', filename=manifest[name])
+        if name in VENDOR and not os.path.isfile(os.path.join(app.static_folder, name)):
+            return VENDOR[name]
+        return url_for('static', filename=name)
+
+    return manifest
@@ -0,0 +1,46 @@
+"""Single-core throughput of the batch scorer.
+
+    python benchmarks/batch.py --rows 2000000 --format csv
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import score_stream  # noqa: E402
+
+
+def generate(rows, fmt):
+    rng = random.Random(0)
+    if fmt == 'csv':
+        yield 'price,cogs,overhead,startup\n'
+    for _ in range(rows):
+        values = (round(rng.uniform(5, 100), 2), round(rng.uniform(1, 60), 2),
+                  round(rng.uniform(500, 20000), 2), round(rng.uniform(0, 50000), 2))
+        if fmt == 'csv':
+            yield '%s,%s,%s,%s\n' % values
+        else:
+            yield json.dumps(dict(zip(('price', 'cogs', 'overhead', 'startup'), values))) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--format', choices=['csv', 'ndjson'], default='csv')
+    args = parser.parse_args()
+
+    source = io.StringIO(''.join(generate(args.rows, args.format)))
+    start = time.perf_counter()
+    written = sum(len(chunk) for chunk in score_stream(source, args.format))
+    elapsed = time.perf_counter() - start
+    print(f'{args.format}: {args.rows} rows in {elapsed:.2f}s '
+          f'({args.rows / elapsed * 60 / 1e6:.1f}M rows/minute, {written / 1e6:.0f} MB out)')
+
+
+if __name__ == '__main__':
+    main()
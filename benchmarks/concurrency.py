@@ -0,0 +1,151 @@
+"""Concurrent-request capacity of the app under different gunicorn workers.
+
+Starts a stub OpenAI endpoint that answers after a fixed delay, runs the app
+under gunicorn with the given worker class, then fires N concurrent blank
+step-3 submits (each with a distinct product so nothing is cached or
+coalesced) while timing a /login request issued in the middle of the burst.
+
+    python benchmarks/concurrency.py --worker-class sync --workers 2
+    python benchmarks/concurrency.py --worker-class gevent --workers 2
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_stub(delay):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            time.sleep(delay)
+            body = json.dumps({
+                'id': 'stub', 'object': 'chat.completion', 'created': 0, 'model': 'gpt-4',
+                'choices': [{'index': 0, 'finish_reason': 'stop', 'message': {
+                    'role': 'assistant', 'content': 'Stub analysis. FINAL SUGGESTION: $25.00'}}],
+                'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2},
+            }).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 1024
+
+    server = Server(('127.0.0.1', free_port()), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def wait_for(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f'{url} did not come up')
+
+
+def wizard_client(base, i):
+    client = requests.Session()
+    client.post(f'{base}/login', data={'access_code': 'bench'})
+    client.get(f'{base}/')
+    client.post(f'{base}/step1', data={'product_description': f'Benchmark product {i}'})
+    client.post(f'{base}/step2', data={'target_audience': 'everyone', 'location': 'anywhere'})
+    return client
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--worker-class', default='gevent')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--delay', type=float, default=2.0, help='stub OpenAI latency in seconds')
+    args = parser.parse_args()
+
+    stub = start_stub(args.delay)
+    port = free_port()
+    instance = tempfile.mkdtemp()
+    env = dict(
+        os.environ,
+        FLASK_SECRET_KEY='bench', SECRET_KEY='bench', OPENAI_API_KEY='bench',
+        OPENAI_API_BASE=f'http://127.0.0.1:{stub.server_port}/v1',
+        SESSION_DB=os.path.join(instance, 'sessions.sqlite3'),
+        AI_CACHE_DB=os.path.join(instance, 'ai_cache.sqlite3'),
+        AI_LEASE_DB=os.path.join(instance, 'ai_leases.sqlite3'),
+        AI_PREFETCH='0',
+        GUNICORN_BIND=f'127.0.0.1:{port}',
+        GUNICORN_WORKER_CLASS=args.worker_class,
+        WEB_CONCURRENCY=str(args.workers),
+        GUNICORN_TIMEOUT='600',
+    )
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base = f'http://127.0.0.1:{port}'
+    try:
+        wait_for(f'{base}/login')
+        with ThreadPoolExecutor(max_workers=64) as pool:
+            clients = list(pool.map(lambda i: wizard_client(base, i), range(args.concurrency)))
+
+        def submit(client):
+            start = time.perf_counter()
+            response = client.post(f'{base}/step3', data={}, timeout=600)
+            # A failed AI call re-renders step 3 with a form error (alert-danger)
+            # and a 200, so the stub's suggestion has to be in the body
+            ok = (response.status_code == 200 and 'alert-danger' not in response.text
+                  and 'FINAL SUGGESTION: $25.00' in response.text)
+            return ok, time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=args.concurrency + 1) as pool:
+            started = time.perf_counter()
+            futures = [pool.submit(submit, client) for client in clients]
+            time.sleep(args.delay / 2)
+            login_start = time.perf_counter()
+            requests.get(f'{base}/login', timeout=600)
+            login_latency = time.perf_counter() - login_start
+            results = [f.result() for f in futures]
+            elapsed = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait()
+        stub.shutdown()
+
+    ok = sum(1 for success, _ in results if success)
+    latencies = sorted(latency for _, latency in results)
+    print(f'worker_class={args.worker_class} workers={args.workers} '
+          f'concurrency={args.concurrency} upstream_delay={args.delay}s')
+    print(f'  completed {ok}/{len(results)} in {elapsed:.1f}s '
+          f'({ok / elapsed:.1f} AI requests/s)')
+    print(f'  p50 {latencies[len(latencies) // 2]:.1f}s  max {latencies[-1]:.1f}s')
+    print(f'  /login during the burst: {login_latency:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
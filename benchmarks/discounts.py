@@ -0,0 +1,38 @@
+"""Break-even under a volume-discount cost schedule for many rows at once.
+
+    python benchmarks/discounts.py --rows 1000000 --breaks 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import cost_schedule, tiered_break_even  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--breaks', type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    thresholds = np.sort(rng.uniform(1, 100000, args.breaks))
+    costs = np.sort(rng.uniform(1, 10, args.breaks))[::-1]
+    schedule = cost_schedule(12, zip(thresholds, costs))
+    prices = rng.uniform(5, 30, args.rows)
+    fixed = rng.uniform(500, 20000, args.rows)
+
+    start = time.perf_counter()
+    units = tiered_break_even(prices, schedule, fixed)
+    elapsed = time.perf_counter() - start
+    print(f'{args.rows} rows x {args.breaks} breakpoints in {elapsed * 1000:.0f} ms '
+          f'({np.isinf(units).mean():.0%} never break even)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Cash-flow projection over many random scenarios at once.
+
+    python benchmarks/projection.py --scenarios 10000 --months 60
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import project_cash_flow  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scenarios', type=int, default=10000)
+    parser.add_argument('--months', type=int, default=60)
+    parser.add_argument('--ramp', default='s-curve')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = args.scenarios
+    inputs = dict(price=rng.uniform(5, 100, n), variable_cost=rng.uniform(1, 60, n),
+                  fixed_cost=rng.uniform(500, 20000, n), startup=rng.uniform(0, 50000, n),
+                  sales_volume=rng.uniform(10, 2000, n), growth=rng.uniform(-0.02, 0.1, n),
+                  ramp_months=rng.integers(0, 12, n))
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = project_cash_flow(**inputs, months=args.months, ramp=args.ramp)
+        timings.append(time.perf_counter() - start)
+    paid_back = (result['payback_month'] > 0).mean()
+    print(f'{n} scenarios x {args.months} months: best {min(timings) * 1000:.1f} ms, '
+          f'median {sorted(timings)[len(timings) // 2] * 1000:.1f} ms '
+          f'({paid_back:.0%} pay back within the horizon)')
+
+
+if __name__ == '__main__':
+    main()
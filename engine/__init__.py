@@ -0,0 +1,48 @@
+"""Vectorized break-even calculations shared by the wizard, APIs and CLI."""
+from .batch import BatchFormatError, score_stream
+from .breakeven import DEFAULT_AMORTIZATION_MONTHS, break_even, monthly_fixed_costs
+from .capacity import capacity_break_even, staircase
+from .chartseries import CHART_POINTS, break_even_model, lttb
+from .discounts import cost_schedule, tiered_break_even, total_variable_cost
+from .goalseek import GOALS, goal_seek, goal_seek_rows
+from .heatmap import heatmap_meta, heatmap_tile
+from .pricing import DEMAND_MODELS, demand_curve, optimize_price
+from .projection import DEFAULT_HORIZON_MONTHS, RAMPS, cash_flow_summary, project_cash_flow
+from .salesmix import mix_weights, sales_mix_break_even, weighted_unit
+from .sensitivity import DRIVERS, tornado
+from .simulation import DISTRIBUTIONS, simulate_break_even
+
+__all__ = [
+    'BatchFormatError',
+    'CHART_POINTS',
+    'DEFAULT_AMORTIZATION_MONTHS',
+    'DEFAULT_HORIZON_MONTHS',
+    'DEMAND_MODELS',
+    'DISTRIBUTIONS',
+    'DRIVERS',
+    'GOALS',
+    'RAMPS',
+    'break_even',
+    'break_even_model',
+    'capacity_break_even',
+    'cash_flow_summary',
+    'cost_schedule',
+    'demand_curve',
+    'goal_seek',
+    'goal_seek_rows',
+    'heatmap_meta',
+    'heatmap_tile',
+    'lttb',
+    'mix_weights',
+    'monthly_fixed_costs',
+    'optimize_price',
+    'project_cash_flow',
+    'sales_mix_break_even',
+    'score_stream',
+    'simulate_break_even',
+    'staircase',
+    'tiered_break_even',
+    'tornado',
+    'total_variable_cost',
+    'weighted_unit',
+]
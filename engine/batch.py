@@ -0,0 +1,123 @@
+"""Streaming batch scoring of CSV or NDJSON rows.
+
+Rows are read lazily, scored in fixed-size chunks with one vectorized
+``break_even`` call per chunk, and written back as text chunks, so memory
+stays flat however large the input is. Every input row produces exactly one
+output row, in order; rows that can't be parsed get an error instead of a
+result.
+"""
+import csv
+import io
+import json
+from itertools import islice
+
+import numpy as np
+
+from .breakeven import DEFAULT_AMORTIZATION_MONTHS, break_even
+
+FIELDS = ('price_range', 'cost_of_goods', 'overhead_costs', 'startup_costs')
+OPTIONAL_FIELDS = {'startup_costs'}
+ALIASES = {
+    'price': 'price_range',
+    'cogs': 'cost_of_goods',
+    'variable_cost': 'cost_of_goods',
+    'overhead': 'overhead_costs',
+    'fixed_cost': 'overhead_costs',
+    'startup': 'startup_costs',
+}
+CHUNK_SIZE = 50000
+
+
+class BatchFormatError(ValueError):
+    pass
+
+
+def _canonical(name):
+    name = name.strip().lower()
+    return ALIASES.get(name, name)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _score(values, amortization_months):
+    return break_even(values[:, 0], values[:, 1], values[:, 2], values[:, 3], amortization_months)
+
+
+def _format_units(units):
+    return 'inf' if units == np.inf else repr(units)
+
+
+def score_csv(lines, amortization_months=DEFAULT_AMORTIZATION_MONTHS, chunk_size=CHUNK_SIZE):
+    """Yield CSV text: the input columns plus ``break_even_units`` and ``error``."""
+    reader = csv.reader(lines)
+    try:
+        header = next(reader)
+    except StopIteration:
+        return
+    columns = {_canonical(name): i for i, name in enumerate(header)}
+    missing = [f for f in FIELDS if f not in columns and f not in OPTIONAL_FIELDS]
+    if missing:
+        raise BatchFormatError(f"CSV header is missing column(s): {', '.join(missing)}")
+    indexes = [columns.get(f) for f in FIELDS]
+
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(header + ['break_even_units', 'error'])
+    yield out.getvalue()
+
+    for rows in _chunks(reader, chunk_size):
+        values = np.full((len(rows), len(FIELDS)), np.nan)
+        errors = [''] * len(rows)
+        for n, row in enumerate(rows):
+            try:
+                values[n] = [float(row[i]) if i is not None and row[i] != '' else 0.0 for i in indexes]
+            except (ValueError, IndexError):
+                errors[n] = 'invalid or missing number'
+        units = _score(values, amortization_months)
+        out.seek(0)
+        out.truncate()
+        writer.writerows(
+            row + (['', errors[n]] if errors[n] else [_format_units(u), ''])
+            for n, (row, u) in enumerate(zip(rows, units.tolist()))
+        )
+        yield out.getvalue()
+
+
+def score_ndjson(lines, amortization_months=DEFAULT_AMORTIZATION_MONTHS, chunk_size=CHUNK_SIZE):
+    """Yield NDJSON text: each input object plus ``break_even_units`` (null if none)."""
+    for chunk in _chunks((line for line in lines if line.strip()), chunk_size):
+        records = []
+        values = np.full((len(chunk), len(FIELDS)), np.nan)
+        for n, line in enumerate(chunk):
+            try:
+                record = json.loads(line)
+                fields = {_canonical(k): v for k, v in record.items()}
+                values[n] = [float(fields.get(f) or 0) if f in OPTIONAL_FIELDS else float(fields[f])
+                             for f in FIELDS]
+            except KeyError as e:
+                record = {'error': f'missing field: {e.args[0]}'}
+            except (ValueError, TypeError, AttributeError) as e:
+                record = {'error': f'invalid row: {e}'}
+            records.append(record)
+        units = _score(values, amortization_months)
+        parts = []
+        for record, u in zip(records, units.tolist()):
+            if 'error' not in record:
+                record['break_even_units'] = None if u == np.inf else u
+            parts.append(json.dumps(record))
+        yield '\n'.join(parts) + '\n'
+
+
+def score_stream(lines, fmt, amortization_months=DEFAULT_AMORTIZATION_MONTHS, chunk_size=CHUNK_SIZE):
+    if fmt == 'csv':
+        return score_csv(lines, amortization_months, chunk_size)
+    if fmt == 'ndjson':
+        return score_ndjson(lines, amortization_months, chunk_size)
+    raise BatchFormatError(f'Unsupported format: {fmt}')
@@ -0,0 +1,39 @@
+import numpy as np
+
+# Startup costs are spread over the first year unless told otherwise
+DEFAULT_AMORTIZATION_MONTHS = 12
+
+
+def _result(values):
+    # Scalars in, Python float out; arrays in, ndarray out
+    return float(values) if np.ndim(values) == 0 else values
+
+
+def monthly_fixed_costs(fixed_cost, startup=0.0, amortization_months=DEFAULT_AMORTIZATION_MONTHS):
+    """Monthly fixed costs including the amortized share of startup costs.
+
+    A non-positive ``amortization_months`` leaves startup costs out.
+    """
+    fixed_cost, startup, months = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (fixed_cost, startup, amortization_months))
+    )
+    amortized = np.divide(startup, months, out=np.zeros(months.shape), where=months > 0)
+    return _result(fixed_cost + amortized)
+
+
+def break_even(price, variable_cost, fixed_cost, startup=0.0,
+               amortization_months=DEFAULT_AMORTIZATION_MONTHS):
+    """Units per month needed to cover fixed and amortized startup costs.
+
+    Every argument may be a scalar or an array; arrays broadcast against each
+    other, so a whole grid of scenarios is evaluated in one call. Where the
+    price does not exceed the variable cost there is no break-even point and
+    the result is ``inf``.
+    """
+    price = np.asarray(price, dtype=float)
+    variable_cost = np.asarray(variable_cost, dtype=float)
+    fixed = np.asarray(monthly_fixed_costs(fixed_cost, startup, amortization_months))
+    margin = price - variable_cost
+    with np.errstate(divide='ignore', invalid='ignore'):
+        units = np.where(margin > 0, fixed / margin, np.inf)
+    return _result(units)
@@ -0,0 +1,76 @@
+"""Break-even with step-function fixed costs and a capacity limit.
+
+Fixed costs rise in tiers: each tier adds capacity (units per month) and a
+fixed monthly cost that is incurred as soon as volume needs any of that
+capacity. Within a tier profit is linear in volume, so every tier is a
+segment solved in closed form; the segments are evaluated as arrays and
+adjacent profitable stretches are merged. Each added tier can push profit
+back below zero, so there may be several break-even points, or none.
+"""
+import numpy as np
+
+from .breakeven import DEFAULT_AMORTIZATION_MONTHS, monthly_fixed_costs
+
+
+def _segments(tiers, max_capacity):
+    # Tier edges (cumulative capacity) and cumulative fixed cost per tier,
+    # cut off at max_capacity
+    capacity = np.array([t[0] for t in tiers], dtype=float)
+    cost = np.array([t[1] for t in tiers], dtype=float)
+    upper = np.cumsum(capacity)
+    lower = upper - capacity
+    fixed = np.cumsum(cost)
+    if max_capacity is not None:
+        keep = lower < max_capacity
+        lower, upper, fixed = lower[keep], np.minimum(upper[keep], max_capacity), fixed[keep]
+    return lower, upper, fixed
+
+
+def capacity_break_even(price, variable_cost, tiers, max_capacity=None, startup=0.0,
+                        amortization_months=DEFAULT_AMORTIZATION_MONTHS):
+    """Break-even points and profitable volume ranges under tiered fixed costs.
+
+    ``tiers`` is a sequence of ``(capacity, fixed_cost)`` pairs in the order
+    they are added; the first is the base tier. Volume is capped at
+    ``max_capacity`` (or the total tier capacity). Returns the volumes where
+    profit turns non-negative (``break_even_points``), the ``[start, end]``
+    volume ranges that are profitable, and the segments themselves.
+    """
+    lower, upper, fixed = _segments(tiers, max_capacity)
+    fixed = fixed + monthly_fixed_costs(0, startup, amortization_months)
+    margin = price - variable_cost
+    if margin > 0:
+        roots = fixed / margin
+    else:
+        roots = np.full(fixed.shape, np.inf)
+    # Profitable part of each segment: from the root (or the segment's lower
+    # edge, if already past it) up to the segment's upper edge
+    start = np.maximum(roots, lower)
+    profitable = start <= upper
+    # A stretch continues from the previous segment when both are profitable
+    # right at their shared edge
+    continues = np.zeros(profitable.shape, dtype=bool)
+    continues[1:] = profitable[1:] & profitable[:-1] & (start[1:] <= lower[1:])
+    first = profitable & ~continues
+    # A stretch ends where the next segment doesn't continue it
+    last = profitable & ~np.append(continues[1:], False)
+    return {
+        'capacity': float(upper[-1]) if len(upper) else 0.0,
+        'break_even_points': start[first].tolist(),
+        'profitable_ranges': [list(r) for r in zip(start[first].tolist(), upper[last].tolist())],
+        'segments': [
+            {'from': lo, 'to': hi, 'fixed_cost': f}
+            for lo, hi, f in zip(lower.tolist(), upper.tolist(), fixed.tolist())
+        ],
+    }
+
+
+def staircase(price, variable_cost, segments):
+    """Chart points for total costs (with a jump at each tier) and revenue."""
+    costs = []
+    for segment in segments:
+        for units in (segment['from'], segment['to']):
+            costs.append({'x': units, 'y': round(units * variable_cost + segment['fixed_cost'], 2)})
+    capacity = segments[-1]['to'] if segments else 0
+    revenue = [{'x': 0, 'y': 0}, {'x': capacity, 'y': round(capacity * price, 2)}]
+    return {'costs': costs, 'revenue': revenue}
@@ -0,0 +1,93 @@
+"""Revenue and cost series for the break-even chart.
+
+``break_even_model`` is what the summary page sends: the price, the fixed
+costs and total variable cost as piecewise-linear knots, which the
+browser evaluates at the resolution it draws (static/js/breakeven.js).
+Units are sampled on a round-numbered grid from zero to twice the
+break-even point, so the resolution follows the numbers (fractions of a
+unit for tiny break-evens, thousands for large ones). The exact crossover
+and every volume-discount breakpoint in range are added as samples, since
+total cost is linear between them. More breakpoints than the chart can
+draw are reduced with Largest-Triangle-Three-Buckets (LTTB), which keeps
+the points that shape the curve.
+"""
+import numpy as np
+
+from .discounts import total_variable_cost
+
+CHART_POINTS = 400
+GRID_STEPS = 20
+
+
+def nice_step(span, steps=GRID_STEPS):
+    """Smallest 1, 2, 2.5 or 5 times a power of ten that covers ``span`` in ``steps``."""
+    raw = span / steps
+    magnitude = 10.0 ** np.floor(np.log10(raw))
+    for multiple in (1, 2, 2.5, 5, 10):
+        if multiple * magnitude >= raw:
+            return multiple * magnitude
+    return 10 * magnitude
+
+
+def lttb(x, y, threshold):
+    """Sorted indices of the ``threshold`` points of ``(x, y)`` that LTTB keeps.
+
+    The first and last points are always kept; the rest are split into
+    ``threshold - 2`` buckets, and from each the point forming the largest
+    triangle with the previously kept point and the next bucket's average.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[hi:next_hi].mean(), y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def _grid(break_even_units):
+    # Round grid step and point count covering twice the break-even
+    span = 2 * break_even_units or 10.0
+    step = nice_step(span)
+    return step, int(np.ceil(span / step - 1e-9))
+
+
+def break_even_model(price, variable_cost, fixed, break_even_units, schedule=None,
+                     max_knots=CHART_POINTS):
+    """Compact chart model: the series are derived from it by interpolation.
+
+    Total variable cost at ``u`` units is interpolated between ``knots``
+    (``units`` and ``costs``, starting at zero) and grows by ``unit_cost``
+    per unit past the last knot. Only the volume-discount breakpoints up to
+    ``end`` are sent, reduced to ``max_knots`` with LTTB. ``step`` is the
+    round grid step for the chart's samples.
+    """
+    step, count = _grid(break_even_units)
+    end = count * step
+    if schedule is None:
+        units, costs, unit_cost = np.zeros(1), np.zeros(1), variable_cost
+    else:
+        thresholds = schedule['thresholds']
+        units = thresholds[thresholds < end]
+        costs = total_variable_cost(units, schedule)
+        unit_cost = schedule['unit_costs'][len(units) - 1]
+        if len(units) > max_knots:
+            keep = lttb(units, costs, max_knots)
+            units, costs = units[keep], costs[keep]
+    return {
+        'price': float(price),
+        'fixed': round(float(fixed), 2),
+        'break_even': float(break_even_units),
+        'step': float(step),
+        'end': float(end),
+        'knots': {'units': units.tolist(), 'costs': np.round(costs, 2).tolist()},
+        'unit_cost': float(unit_cost),
+    }
@@ -0,0 +1,93 @@
+"""Break-even with volume-discounted (piecewise-linear) variable costs.
+
+A cost schedule gives the unit cost from each volume threshold onwards, so
+total variable cost is piecewise linear in volume. The schedule is turned
+into cumulative-cost arrays once; total cost at any volume is then one
+``searchsorted`` lookup, and break-even is found by bisecting over the
+segments for every scenario at once, then solving the linear equation
+inside the segment found.
+"""
+import numpy as np
+
+from .breakeven import DEFAULT_AMORTIZATION_MONTHS, monthly_fixed_costs
+
+
+def cost_schedule(unit_cost, breaks=()):
+    """Cumulative-cost arrays for a base unit cost plus ``(from_units, unit_cost)`` breaks.
+
+    The base cost applies from the first unit; each break's cost applies to
+    the units beyond its threshold (incremental, like tiered supplier
+    pricing).
+    """
+    pairs = sorted((float(units), float(cost)) for units, cost in breaks if float(units) > 0)
+    thresholds = np.array([0.0] + [units for units, _ in pairs])
+    unit_costs = np.array([float(unit_cost)] + [cost for _, cost in pairs])
+    # cumulative[k]: total variable cost of the first thresholds[k] units
+    cumulative = np.concatenate(([0.0], np.cumsum(unit_costs[:-1] * np.diff(thresholds))))
+    return {'thresholds': thresholds, 'unit_costs': unit_costs, 'cumulative': cumulative}
+
+
+def total_variable_cost(units, schedule):
+    """Exact total variable cost of ``units`` (scalar or array) under ``schedule``."""
+    units = np.asarray(units, dtype=float)
+    thresholds, unit_costs, cumulative = schedule['thresholds'], schedule['unit_costs'], schedule['cumulative']
+    k = np.maximum(np.searchsorted(thresholds, units, side='right') - 1, 0)
+    return cumulative[k] + unit_costs[k] * (units - thresholds[k])
+
+
+def tiered_break_even(price, schedule, fixed_cost, startup=0.0,
+                      amortization_months=DEFAULT_AMORTIZATION_MONTHS, base_cost=None):
+    """Units per month at which revenue first covers tiered variable and fixed costs.
+
+    ``price``, ``fixed_cost`` and ``startup`` may be arrays (one per
+    scenario); the breaks are shared, but ``base_cost`` may replace the
+    schedule's first unit cost per scenario. Returns ``inf`` where volume
+    never breaks even, which happens only if the last tier's unit cost is
+    not below the price.
+    """
+    thresholds, unit_costs, cumulative = schedule['thresholds'], schedule['unit_costs'], schedule['cumulative']
+    price, fixed, base_cost = np.broadcast_arrays(
+        np.asarray(price, dtype=float),
+        np.asarray(monthly_fixed_costs(fixed_cost, startup, amortization_months)),
+        np.asarray(unit_costs[0] if base_cost is None else base_cost, dtype=float),
+    )
+    last = len(thresholds) - 1
+    # The base cost applies only to units below the first break
+    first_break = thresholds[1] if last else np.inf
+    extra = base_cost - unit_costs[0]
+
+    def cost_before(k):
+        # Total variable cost of the first thresholds[k] units
+        return cumulative[k] + extra * np.minimum(thresholds[k], first_break)
+
+    def covered(k):
+        # Whether revenue covers costs by the end of segment k (k < last)
+        return price * thresholds[k + 1] - cost_before(k + 1) >= fixed
+
+    if np.all(np.diff(unit_costs[1:]) <= 0) and (not last or np.all(base_cost >= unit_costs[1])):
+        # Profit falls while the margin is negative and rises once it is
+        # positive, so "covered by the end of segment k" flips at most once
+        lo = np.zeros(price.shape, dtype=int)
+        hi = np.full(price.shape, last)
+        while np.any(lo < hi):
+            mid = (lo + hi) // 2
+            ok = covered(np.minimum(mid, last - 1)) & (lo < hi)
+            hi = np.where(ok, mid, hi)
+            lo = np.where(ok | (lo >= hi), lo, mid + 1)
+        k = lo
+    else:
+        # Costs that rise with volume can break even and then lose money
+        # again; take the first segment that covers costs
+        ends = (price[..., np.newaxis] * thresholds[1:]
+                - cumulative[1:] - extra[..., np.newaxis] * np.minimum(thresholds[1:], first_break)
+                ) >= fixed[..., np.newaxis]
+        k = np.where(ends.any(axis=-1), ends.argmax(axis=-1), last)
+
+    unit_cost = np.where(k == 0, base_cost, unit_costs[k])
+    margin = price - unit_cost
+    with np.errstate(divide='ignore', invalid='ignore'):
+        units = np.where(margin > 0,
+                         (fixed + cost_before(k) - unit_cost * thresholds[k]) / margin,
+                         np.inf)
+    units = np.maximum(units, thresholds[k])
+    return float(units) if units.ndim == 0 else units
@@ -0,0 +1,96 @@
+"""Goal seek: solve the break-even equation for any one of its inputs.
+
+Break-even means ``price * units = variable costs(units) + fixed + startup
+/ amortization_months``. With a flat unit cost, or with volume discounts
+(where total variable cost is still linear in the base unit cost), price,
+unit cost, overhead and startup costs have closed-form solutions; units
+under a discount schedule come from the vectorized segment search of
+``tiered_break_even``. Every input may be an array, so a batch of targets
+is solved in one call.
+"""
+import numpy as np
+
+from .breakeven import DEFAULT_AMORTIZATION_MONTHS, break_even, monthly_fixed_costs
+from .discounts import cost_schedule, tiered_break_even, total_variable_cost
+
+GOALS = ('price', 'variable_cost', 'fixed_cost', 'startup', 'units')
+
+
+def _variable_cost_parts(units, discounts):
+    # Total variable cost is base_cost * base_units + discounted: the base
+    # unit cost applies up to the first break, the breaks beyond it
+    if discounts is None:
+        return units, np.zeros(np.shape(units))
+    return np.minimum(units, discounts['thresholds'][1]), total_variable_cost(units, discounts)
+
+
+def goal_seek(goal, price=None, variable_cost=None, fixed_cost=None, startup=0.0, units=None,
+              amortization_months=DEFAULT_AMORTIZATION_MONTHS, breaks=(), extra_fixed_cost=0.0):
+    """Value of ``goal`` that makes the business break even at the other inputs.
+
+    ``goal`` is one of GOALS; the other four inputs must be given and
+    broadcast against each other. ``breaks`` are ``(from_units,
+    unit_cost)`` volume discounts on top of the base ``variable_cost``.
+    ``extra_fixed_cost`` is a monthly fixed cost kept apart from
+    ``fixed_cost`` (e.g. a marketing budget), so a solved ``fixed_cost``
+    excludes it.
+    Solutions may be negative (e.g. the overhead left over when the target
+    already makes a profit) or ``inf`` (units that never break even).
+    """
+    if goal not in GOALS:
+        raise ValueError(f'Unknown goal: {goal}')
+    values = {'price': price, 'variable_cost': variable_cost, 'fixed_cost': fixed_cost,
+              'startup': startup, 'units': units}
+    missing = [name for name, value in values.items() if value is None and name != goal]
+    if missing:
+        raise ValueError(f"Missing input(s): {', '.join(missing)}")
+    breaks = sorted((float(u), float(c)) for u, c in breaks if float(u) > 0)
+    arrays = np.broadcast_arrays(*(np.asarray(0.0 if v is None else v, dtype=float) for v in values.values()))
+    price, variable_cost, fixed_cost, startup, units = arrays
+    months = float(amortization_months)
+    extra = np.asarray(extra_fixed_cost, dtype=float)
+
+    if goal == 'units':
+        if not breaks:
+            result = break_even(price, variable_cost, fixed_cost + extra, startup, months)
+        else:
+            result = tiered_break_even(price, cost_schedule(0.0, breaks), fixed_cost + extra, startup, months,
+                                       base_cost=variable_cost)
+        return np.asarray(result, dtype=float)
+
+    base_units, discounted = _variable_cost_parts(units, cost_schedule(0.0, breaks) if breaks else None)
+    contribution = price * units - variable_cost * base_units - discounted
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if goal == 'price':
+            return (variable_cost * base_units + discounted
+                    + monthly_fixed_costs(fixed_cost + extra, startup, months)) / units
+        if goal == 'variable_cost':
+            return (price * units - discounted - monthly_fixed_costs(fixed_cost + extra, startup, months)) / base_units
+        if goal == 'fixed_cost':
+            return contribution - extra - monthly_fixed_costs(0.0, startup, months)
+        # Startup costs are only recovered when amortized over some months
+        if months <= 0:
+            raise ValueError('Startup costs cannot be solved for without an amortization period')
+        return (contribution - fixed_cost - extra) * months
+
+
+def goal_seek_rows(goal, inputs, amortization_months=DEFAULT_AMORTIZATION_MONTHS, breaks=(),
+                   max_rows=None, extra_fixed_cost=0.0):
+    """Solve a batch given as scalars or equal-length lists and return one dict per row.
+
+    Each row holds every input plus the solved ``goal`` (None for inf or
+    undefined) and ``feasible``: whether the solution is finite and not
+    negative.
+    """
+    arrays = {name: np.asarray(value, dtype=float) for name, value in inputs.items()}
+    shape = np.broadcast_shapes(*(a.shape for a in arrays.values()))
+    if len(shape) > 1 or (max_rows is not None and shape and shape[0] > max_rows):
+        raise ValueError(f'Inputs must be numbers or lists of at most {max_rows} numbers')
+    solved = np.atleast_1d(goal_seek(goal, amortization_months=amortization_months, breaks=breaks,
+                                     extra_fixed_cost=extra_fixed_cost, **arrays))
+    columns = {name: np.broadcast_to(a, solved.shape) for name, a in arrays.items()}
+    columns[goal] = solved
+    feasible = (np.isfinite(solved) & (solved >= 0)).tolist()
+    # inf and nan (e.g. 0/0) have no JSON form
+    values = [np.where(np.isfinite(c), c, None).tolist() for c in columns.values()]
+    return [dict(zip(columns, row), feasible=ok) for row, ok in zip(zip(*values), feasible)]
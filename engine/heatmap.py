@@ -0,0 +1,65 @@
+"""Price × cost what-if heatmap, served as quantized tiles.
+
+The heatmap is an unbounded grid of cells: column ``i`` is the price
+``price_origin + i * price_step`` and row ``j`` the unit cost
+``cost_origin + j * cost_step``, so cell (0, 0) is the session's own
+values. It is cut into square tiles that are computed independently with
+one broadcast ``break_even`` call and shipped as little-endian uint16 codes
+on a log scale, about 20 KB per 100 × 100 tile.
+"""
+import numpy as np
+
+from .breakeven import DEFAULT_AMORTIZATION_MONTHS, break_even
+
+TILE_SIZE = 100
+LEVELS = 65534
+NO_BREAK_EVEN = 65535
+
+
+def heatmap_meta(price, variable_cost, fixed_cost, startup=0.0, cells=200, span=0.5,
+                 amortization_months=DEFAULT_AMORTIZATION_MONTHS):
+    """Grid geometry and quantization scale centred on the given inputs.
+
+    The default view of ``cells`` × ``cells`` covers ±``span`` around the
+    price and around the unit cost (or 10% of the price when cost is 0).
+    """
+    cost_reference = variable_cost if variable_cost > 0 else price * 0.1
+    baseline = break_even(price, variable_cost, fixed_cost, startup, amortization_months)
+    return {
+        'price_origin': price,
+        'price_step': price * span * 2 / cells,
+        'cost_origin': variable_cost,
+        'cost_step': cost_reference * span * 2 / cells,
+        'fixed_cost': fixed_cost,
+        'startup': startup,
+        'amortization_months': amortization_months,
+        'cells': cells,
+        'tile_size': TILE_SIZE,
+        # Values above max_units share the top colour
+        'max_units': max(baseline * 20, 100.0) if np.isfinite(baseline) else 10000.0,
+        'levels': LEVELS,
+        'no_break_even': NO_BREAK_EVEN,
+    }
+
+
+def quantize(units, max_units):
+    """Map break-even units to uint16 codes: log1p-scaled, NO_BREAK_EVEN for inf.
+
+    Decode with ``expm1(code / LEVELS * log1p(max_units))``.
+    """
+    scale = LEVELS / np.log1p(max_units)
+    codes = np.rint(np.log1p(np.minimum(units, max_units)) * scale)
+    codes[np.isinf(units)] = NO_BREAK_EVEN
+    return codes.astype('<u2')
+
+
+def heatmap_tile(meta, tx, ty):
+    """Quantized break-even codes for tile (tx, ty), row-major by cost then price."""
+    size = meta['tile_size']
+    i = np.arange(tx * size, (tx + 1) * size)
+    j = np.arange(ty * size, (ty + 1) * size)
+    prices = np.maximum(meta['price_origin'] + i * meta['price_step'], 0)
+    costs = np.maximum(meta['cost_origin'] + j * meta['cost_step'], 0)
+    units = break_even(prices[np.newaxis, :], costs[:, np.newaxis], meta['fixed_cost'],
+                       meta['startup'], meta['amortization_months'])
+    return quantize(units, meta['max_units']).tobytes()
@@ -0,0 +1,100 @@
+"""Profit-maximizing price for a demand curve.
+
+Monthly profit ``(price - variable_cost) * demand(price) - fixed costs`` is
+evaluated over a dense price grid in one pass; the best grid point brackets
+the optimum, which is then refined by bisecting on the sign of the profit
+slope.
+"""
+import numpy as np
+
+from .breakeven import DEFAULT_AMORTIZATION_MONTHS, break_even, monthly_fixed_costs
+
+DEMAND_MODELS = ('linear', 'elasticity', 'points')
+GRID_POINTS = 2001
+
+
+def demand_curve(model, reference_price=None, reference_volume=None, choke_price=None,
+                 elasticity=None, points=None):
+    """Return ``(demand, max_price)``: a vectorized units-per-month function and
+    the highest price worth searching.
+
+    ``linear`` runs through (reference price, reference volume) down to zero
+    at ``choke_price``; ``elasticity`` is constant-elasticity demand through
+    the reference point; ``points`` interpolates ``(price, volume)`` pairs
+    linearly, with no demand above the highest price given.
+    """
+    if model == 'linear':
+        if not (reference_price and reference_volume and choke_price) or choke_price <= reference_price:
+            raise ValueError('Linear demand needs a reference price and volume and a higher choke price')
+        slope = reference_volume / (choke_price - reference_price)
+        return (lambda p: np.maximum(slope * (choke_price - p), 0)), choke_price
+    if model == 'elasticity':
+        if not (reference_price and reference_volume and elasticity) or elasticity <= 0:
+            raise ValueError('Constant-elasticity demand needs a reference price and volume and a positive elasticity')
+        # Inelastic demand (elasticity <= 1) rewards ever-higher prices, so
+        # the search is capped at 10x the reference price
+        return (lambda p: reference_volume * (np.maximum(p, 1e-9) / reference_price) ** -elasticity), \
+            reference_price * 10
+    if model == 'points':
+        try:
+            pairs = sorted((float(p), float(v)) for p, v in points or ())
+        except (TypeError, ValueError):
+            raise ValueError('Demand points must be a list of [price, volume] number pairs')
+        if not np.isfinite(pairs).all():
+            raise ValueError('Demand points must be finite numbers')
+        if len(pairs) < 2:
+            raise ValueError('A demand curve needs at least two (price, volume) points')
+        prices, volumes = np.array(pairs).T
+        return (lambda p: np.interp(p, prices, volumes, right=0.0)), prices[-1]
+    raise ValueError(f'Unknown demand model: {model}')
+
+
+def optimize_price(demand, max_price, variable_cost, fixed_cost=0.0, startup=0.0,
+                   amortization_months=DEFAULT_AMORTIZATION_MONTHS, grid_points=GRID_POINTS,
+                   tolerance=1e-6):
+    """Price that maximizes monthly profit, with its volume, profit and break-even.
+
+    ``at_limit`` is set when the best price is the top of the searched
+    range, i.e. profit was still rising there. The grid of prices and
+    profits is returned (every 20th point) for charting.
+    """
+    fixed = monthly_fixed_costs(fixed_cost, startup, amortization_months)
+    profit = lambda p: (p - variable_cost) * demand(p) - fixed  # noqa: E731
+    low = max(variable_cost, 0.0)
+    if max_price <= low:
+        raise ValueError('No price above the unit cost has any demand')
+    prices = np.linspace(low, max_price, grid_points)
+    profits = profit(prices)
+    best = int(np.argmax(profits))
+
+    # Bracket [best - 1, best + 1] holds the optimum; the slope changes from
+    # positive to negative inside it
+    lo, hi = prices[max(best - 1, 0)], prices[min(best + 1, grid_points - 1)]
+    step = (max_price - low) / (grid_points - 1) * 1e-3
+    slope = lambda p: profit(p + step) - profit(p - step)  # noqa: E731
+    if 0 < best < grid_points - 1:
+        while hi - lo > tolerance * max(1.0, hi):
+            mid = (lo + hi) / 2
+            if slope(mid) > 0:
+                lo = mid
+            else:
+                hi = mid
+        price = (lo + hi) / 2
+        if profit(price) < profits[best]:
+            price = prices[best]
+    else:
+        price = prices[best]
+
+    volume = float(demand(price))
+    return {
+        'price': float(price),
+        'volume': volume,
+        'profit': float(profit(price)),
+        'margin': float(price - variable_cost),
+        'break_even_units': break_even(price, variable_cost, fixed_cost, startup, amortization_months),
+        'at_limit': best == grid_points - 1,
+        'curve': {
+            'prices': np.round(prices[::20], 2).tolist(),
+            'profits': np.round(profits[::20], 2).tolist(),
+        },
+    }
@@ -0,0 +1,88 @@
+"""Month-by-month cash-flow and payback projection.
+
+Startup costs are paid up front in month 0; every following month sells
+``sales_volume`` units scaled by a ramp-up curve and compounded monthly
+growth. All scenarios and months are evaluated as arrays, with the last
+axis holding the months, and cumulative cash is a single ``cumsum``.
+"""
+import numpy as np
+
+RAMPS = ('none', 'linear', 's-curve')
+DEFAULT_HORIZON_MONTHS = 24
+
+
+def ramp_curve(months, ramp_months, shape='linear'):
+    """Share of the full sales volume reached in each of months 1..``months``.
+
+    ``ramp_months`` may be an array (one per scenario); the result then has
+    shape ``ramp_months.shape + (months,)``.
+    """
+    ramp_months = np.asarray(ramp_months, dtype=float)[..., np.newaxis]
+    month = np.arange(1, months + 1)
+    if shape == 'none':
+        return np.ones(ramp_months.shape[:-1] + (months,))
+    # A zero-month ramp gives an infinite rate, i.e. full volume at once
+    with np.errstate(divide='ignore'):
+        rate = 1 / np.maximum(ramp_months, 0)
+    progress = np.minimum(month * rate, 1.0)
+    if shape == 'linear':
+        return progress
+    if shape == 's-curve':
+        # Smoothstep: slow start, fastest halfway, flat once ramped up
+        curve = 3 - 2 * progress
+        curve *= progress
+        curve *= progress
+        return curve
+    raise ValueError(f'Unknown ramp shape: {shape}')
+
+
+def project_cash_flow(price, variable_cost, fixed_cost, startup=0.0, sales_volume=0.0,
+                      months=DEFAULT_HORIZON_MONTHS, growth=0.0, ramp_months=0, ramp='linear'):
+    """Monthly units, net cash flow and cumulative cash over ``months`` months.
+
+    Arguments may be scalars or equal-length arrays of scenarios; ``growth``
+    is the monthly growth rate of sales once trading (0.05 = 5%). Returned
+    arrays have shape ``scenarios + (months,)``; ``payback_month`` is the
+    first month (1-based) with non-negative cumulative cash, or 0 if it is
+    not reached within the horizon.
+    """
+    column = lambda x: np.asarray(x, dtype=float)[..., np.newaxis]  # noqa: E731
+    month = np.arange(months)
+    units = ramp_curve(months, ramp_months, ramp) * column(sales_volume) * (1 + column(growth)) ** month
+    net = units * column(np.subtract(price, variable_cost))
+    net -= column(fixed_cost)
+    cumulative = np.cumsum(net, axis=-1)
+    cumulative -= column(startup)
+    # First month at or above zero; argmax is 0 both for month 1 and for
+    # "never", so check the value found
+    first = (cumulative >= 0).argmax(axis=-1)
+    reached = np.take_along_axis(cumulative, first[..., np.newaxis], axis=-1)[..., 0] >= 0
+    return {
+        'units': units,
+        'net': net,
+        'cumulative': cumulative,
+        'payback_month': np.where(reached, first + 1, 0),
+    }
+
+
+def cash_flow_summary(price, variable_cost, fixed_cost, startup=0.0, sales_volume=0.0,
+                      months=DEFAULT_HORIZON_MONTHS, growth=0.0, ramp_months=0, ramp='linear'):
+    """JSON-ready projection of a single scenario for charts and templates."""
+    projection = project_cash_flow(price, variable_cost, fixed_cost, startup, sales_volume,
+                                   months, growth, ramp_months, ramp)
+    cumulative = projection['cumulative']
+    revenue = projection['units'] * price
+    return {
+        'months': months,
+        'growth': growth,
+        'ramp_months': ramp_months,
+        'ramp': ramp,
+        'sales_volume': sales_volume,
+        'labels': list(range(1, months + 1)),
+        'revenue': np.round(revenue, 2).tolist(),
+        'costs': np.round(revenue - projection['net'], 2).tolist(),
+        'cumulative': np.round(cumulative, 2).tolist(),
+        'payback_month': int(projection['payback_month']) or None,
+        'lowest_cash': float(min(cumulative.min(), -startup)),
+        'ending_cash': float(cumulative[-1]),
+    }
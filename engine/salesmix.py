@@ -0,0 +1,65 @@
+"""Break-even for a mix of products (SKUs).
+
+With a fixed sales mix, the business behaves like one product whose price
+and variable cost are the mix-weighted averages; the break-even total is
+fixed costs over the weighted-average contribution margin, split across
+SKUs by their share of units. The SKUs are the last array axis, so many
+scenarios of hundreds of SKUs are evaluated in one pass.
+"""
+import numpy as np
+
+from .breakeven import DEFAULT_AMORTIZATION_MONTHS, break_even
+
+
+def _relative_mix(mix):
+    # Negative volumes count as zero; an all-zero scenario is an even split
+    mix = np.asarray(mix, dtype=float)
+    if (mix < 0).any():
+        mix = np.maximum(mix, 0)
+    total = mix.sum(axis=-1)
+    empty = total <= 0
+    if empty.any():
+        mix = np.where(empty[..., np.newaxis], 1.0, mix)
+        total = np.where(empty, mix.shape[-1], total)
+    return mix, total
+
+
+def mix_weights(mix):
+    """Normalise relative sales volumes to shares summing to 1 per scenario."""
+    mix, total = _relative_mix(mix)
+    return mix / total[..., np.newaxis]
+
+
+def weighted_unit(prices, variable_costs, mix):
+    """Mix-weighted average price and variable cost per unit."""
+    mix, total = _relative_mix(mix)
+    prices, variable_costs = np.broadcast_arrays(np.asarray(prices, dtype=float),
+                                                 np.asarray(variable_costs, dtype=float))
+    # einsum contracts the SKU axis without a weights-sized temporary
+    return (np.einsum('...k,...k->...', mix, prices) / total,
+            np.einsum('...k,...k->...', mix, variable_costs) / total)
+
+
+def sales_mix_break_even(prices, variable_costs, mix, fixed_cost, startup=0.0,
+                         amortization_months=DEFAULT_AMORTIZATION_MONTHS):
+    """Total and per-SKU units per month needed to break even at the given mix.
+
+    ``prices``, ``variable_costs`` and ``mix`` broadcast against each other
+    with SKUs on the last axis; ``fixed_cost`` and ``startup`` broadcast
+    against the leading (scenario) axes. Units are ``inf`` where the
+    weighted-average margin is not positive, even if some SKUs are
+    profitable on their own.
+    """
+    mix, mix_total = _relative_mix(mix)
+    price, variable_cost = weighted_unit(prices, variable_costs, mix)
+    total = np.asarray(break_even(price, variable_cost, fixed_cost, startup, amortization_months))
+    # SKUs outside the mix need no units, even when the total is inf
+    with np.errstate(invalid='ignore'):
+        units = np.where(mix > 0, (total / mix_total)[..., np.newaxis] * mix, 0.0)
+    return {
+        'weighted_price': price,
+        'weighted_cost': variable_cost,
+        'weighted_margin': price - variable_cost,
+        'total_units': total,
+        'units': units,
+    }
@@ -0,0 +1,55 @@
+"""One-at-a-time sensitivity (tornado) analysis of the break-even drivers."""
+import numpy as np
+
+from .breakeven import DEFAULT_AMORTIZATION_MONTHS, break_even
+
+DRIVERS = ('price_range', 'cost_of_goods', 'overhead_costs', 'startup_costs')
+
+
+def _finite_or_none(values):
+    return [None if np.isinf(v) else float(v) for v in values]
+
+
+def tornado(price, variable_cost, fixed_cost, startup=0.0, perturbation=0.1, steps=5,
+            amortization_months=DEFAULT_AMORTIZATION_MONTHS):
+    """Break-even response to moving each driver by up to ±``perturbation``.
+
+    Every driver is varied alone over ``2 * steps + 1`` evenly spaced factors
+    while the others stay at their base value; the whole grid is evaluated
+    in one ``break_even`` call. Drivers are returned ranked by swing (the
+    spread between the lowest and highest break-even across their range).
+    Break-even values with no solution are returned as None.
+    """
+    base = np.array([price, variable_cost, fixed_cost, startup], dtype=float)
+    factors = 1 + np.linspace(-perturbation, perturbation, 2 * steps + 1)
+    # grid[d, k] holds all four inputs for driver d at factor k
+    grid = np.broadcast_to(base, (len(DRIVERS), len(factors), len(DRIVERS))).copy()
+    for d in range(len(DRIVERS)):
+        grid[d, :, d] = base[d] * factors
+    units = break_even(grid[..., 0], grid[..., 1], grid[..., 2], grid[..., 3], amortization_months)
+
+    drivers = []
+    for d, name in enumerate(DRIVERS):
+        series = units[d]
+        low, high = series.min(), series.max()
+        # inf - inf when the driver never allows a break-even
+        with np.errstate(invalid='ignore'):
+            swing = high - low
+        drivers.append({
+            'driver': name,
+            'low': _finite_or_none([low])[0],
+            'high': _finite_or_none([high])[0],
+            'at_minus': _finite_or_none([series[0]])[0],
+            'at_plus': _finite_or_none([series[-1]])[0],
+            'swing': float(swing) if np.isfinite(swing) else None,
+            'series': _finite_or_none(series),
+        })
+    # Unbounded swings (a driver that can push price below cost) rank first
+    drivers.sort(key=lambda d: float('inf') if d['swing'] is None else d['swing'], reverse=True)
+    baseline = break_even(price, variable_cost, fixed_cost, startup, amortization_months)
+    return {
+        'baseline': None if np.isinf(baseline) else baseline,
+        'perturbation': perturbation,
+        'factors': factors.tolist(),
+        'drivers': drivers,
+    }
@@ -0,0 +1,65 @@
+"""Monte Carlo break-even simulation.
+
+Each input is treated as uncertain around the entered value and sampled in
+one vectorized pass; the break-even units of every draw are then summarised
+as percentiles and as the probability of breaking even at a sales volume.
+"""
+import numpy as np
+
+from .breakeven import DEFAULT_AMORTIZATION_MONTHS, break_even
+
+DISTRIBUTIONS = ('triangular', 'lognormal')
+PERCENTILES = (10, 50, 90)
+
+
+def sample(rng, value, spread, draws, distribution='triangular'):
+    """Draw ``draws`` samples centred on ``value``.
+
+    ``triangular`` spans value * (1 ± spread) with its mode at the value;
+    ``lognormal`` has its median at the value and log-space sigma ``spread``.
+    """
+    if distribution == 'triangular':
+        # Inverse CDF of the symmetric triangle; unlike rng.triangular it also
+        # handles a zero width (spread 0 or value 0)
+        u = rng.random(draws)
+        width = abs(value) * spread
+        offset = np.where(u < 0.5, np.sqrt(2 * u) - 1, 1 - np.sqrt(2 * (1 - u)))
+        return value + width * offset
+    if distribution == 'lognormal':
+        return value * np.exp(spread * rng.standard_normal(draws))
+    raise ValueError(f'Unknown distribution: {distribution}')
+
+
+def simulate_break_even(price, variable_cost, fixed_cost, startup=0.0, spread=0.2,
+                        distribution='triangular', draws=100000, sales_volume=None,
+                        amortization_months=DEFAULT_AMORTIZATION_MONTHS, seed=0):
+    """Summarise break-even units over ``draws`` random scenarios.
+
+    Returns the P10/P50/P90 break-even units (``inf`` when that share of
+    draws never breaks even), the share of draws with no break-even point and,
+    if ``sales_volume`` is given, the probability of breaking even at it.
+    """
+    rng = np.random.default_rng(seed)
+    units = break_even(
+        sample(rng, price, spread, draws, distribution),
+        sample(rng, variable_cost, spread, draws, distribution),
+        sample(rng, fixed_cost, spread, draws, distribution),
+        sample(rng, startup, spread, draws, distribution),
+        amortization_months,
+    )
+    # Order statistics rather than np.percentile: interpolating towards an
+    # inf neighbour would give nan
+    ordered = np.sort(units)
+    result = {
+        'draws': draws,
+        'spread': spread,
+        'distribution': distribution,
+        'percentiles': {
+            f'p{q}': float(ordered[min(draws - 1, int(q / 100 * draws))]) for q in PERCENTILES
+        },
+        'no_break_even_share': float(np.isinf(units).mean()),
+    }
+    if sales_volume is not None:
+        result['sales_volume'] = sales_volume
+        result['probability'] = float(np.searchsorted(ordered, sales_volume, side='right') / draws)
+    return result
@@ -0,0 +1,27 @@
+# Gunicorn settings. Picked up automatically by `gunicorn app:app`.
+#
+# The default worker class is gevent: OpenAI calls spend nearly all their
+# time waiting on the network, and a cooperative worker parks the request
+# while it waits instead of pinning a whole process. One worker can then hold
+# hundreds of in-flight AI requests (and SSE streams) while still serving
+# /login and static files. Set GUNICORN_WORKER_CLASS=gthread for a
+# thread-per-request fallback, or sync for the old behaviour.
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '8000')}")
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gevent')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+
+# gevent: concurrent requests per worker
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+# gthread: threads per worker. Only set for gthread, because gunicorn
+# silently switches sync workers to gthread when threads > 1.
+if worker_class == 'gthread':
+    threads = int(os.getenv('GUNICORN_THREADS', 32))
+
+# GPT-4 answers can take well over the 30s default. For async workers this
+# only bounds a stuck event loop, not individual requests.
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
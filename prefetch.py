@@ -0,0 +1,81 @@
+"""Speculative background prefetch of the next step's AI suggestion.
+
+As soon as a step's prompt is fully determined, the wizard submits it here.
+Results are keyed by (session ID, step) and tagged with the prompt hash, so a
+resubmitted step with different inputs cancels the stale prefetch and a
+lookup for the wrong prompt never returns it.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Prefetcher:
+    def __init__(self, max_workers=4, max_pending=16, ttl=600):
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='prefetch')
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.counters = {'submitted': 0, 'rejected': 0, 'cancelled': 0, 'used': 0, 'wasted': 0}
+
+    def _pending(self):
+        return sum(1 for _, future, _ in self._entries.values() if not future.done())
+
+    def _prune(self, now):
+        for key, (_, future, created) in list(self._entries.items()):
+            if future.done() and created + self.ttl < now:
+                del self._entries[key]
+                self.counters['wasted'] += 1
+
+    def submit(self, sid, step, prompt_key, fn, *args):
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            current = self._entries.get((sid, step))
+            if current is not None:
+                if current[0] == prompt_key:
+                    return current[1]
+                # Inputs changed since this prefetch was started
+                current[1].cancel()
+                del self._entries[(sid, step)]
+                self.counters['cancelled'] += 1
+            if self._pending() >= self.max_pending:
+                self.counters['rejected'] += 1
+                return None
+            future = self._executor.submit(fn, *args)
+            self._entries[(sid, step)] = (prompt_key, future, now)
+            self.counters['submitted'] += 1
+            return future
+
+    def wait(self, sid, step, prompt_key, timeout=None):
+        """Result of a matching prefetch, waiting for it if still in flight.
+
+        Returns None when there is no prefetch for this prompt or it failed.
+        """
+        with self._lock:
+            entry = self._entries.get((sid, step))
+            if entry is None or entry[0] != prompt_key:
+                return None
+            del self._entries[(sid, step)]
+        try:
+            result = entry[1].result(timeout)
+        except Exception as e:
+            print(f"Debug - Prefetch for step {step} unusable: {e!r}")
+            return None
+        with self._lock:
+            self.counters['used'] += 1
+        return result
+
+    def discard(self, sid):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == sid]:
+                self._entries.pop(key)[1].cancel()
+                self.counters['cancelled'] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['pending'] = self._pending()
+            stats['entries'] = len(self._entries)
+        return stats
@@ -0,0 +1,307 @@
+"""Server-side session storage.
+
+The browser cookie only carries a signed, opaque session ID. The wizard data
+(including the long AI suggestions) lives in a local SQLite database or in
+one file per session, with TTL-based garbage collection and LRU eviction once
+the store grows past its size cap.
+"""
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+# Seconds a session's access time may lag before a read refreshes it
+TOUCH_INTERVAL = 60
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+
+
+class SessionBackend:
+    """Common bookkeeping for the storage backends.
+
+    Subclasses implement ``_load``, ``_store``, ``_remove`` and ``_collect``;
+    this class keeps the hit/miss counters and throttles garbage collection.
+    """
+
+    def __init__(self, ttl=86400, max_bytes=64 * 1024 * 1024, gc_interval=60):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.gc_interval = gc_interval
+        self._last_gc = 0.0
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'writes': 0, 'deletes': 0,
+                         'expired': 0, 'evicted': 0}
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def get(self, sid):
+        data = self._load(sid, time.time())
+        self._count('hits' if data is not None else 'misses')
+        return data
+
+    def set(self, sid, data):
+        payload = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        self._store(sid, payload, time.time())
+        self._count('writes')
+        self.maybe_gc()
+
+    def delete(self, sid):
+        self._remove(sid)
+        self._count('deletes')
+
+    def maybe_gc(self):
+        now = time.time()
+        if now - self._last_gc < self.gc_interval:
+            return
+        self._last_gc = now
+        self.gc(now)
+
+    def gc(self, now=None):
+        expired, evicted = self._collect(now or time.time())
+        self._count('expired', expired)
+        self._count('evicted', evicted)
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        lookups = counters['hits'] + counters['misses']
+        counters['hit_rate'] = counters['hits'] / lookups if lookups else 0.0
+        counters.update(self.size())
+        counters['backend'] = type(self).__name__
+        return counters
+
+
+class SQLiteSessionBackend(SessionBackend):
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS sessions ('
+                ' sid TEXT PRIMARY KEY, data BLOB NOT NULL,'
+                ' accessed REAL NOT NULL, size INTEGER NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS sessions_accessed ON sessions (accessed)')
+
+    def _connect(self):
+        # One connection per thread and per process; gunicorn forks workers
+        # after the app is imported, so a connection must never cross a fork.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # In WAL mode this only risks the last commits on power loss,
+            # and saves an fsync per request
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _load(self, sid, now):
+        conn = self._connect()
+        row = conn.execute('SELECT data, accessed FROM sessions WHERE sid = ?', (sid,)).fetchone()
+        if row is None:
+            return None
+        if row[1] + self.ttl < now:
+            self._remove(sid)
+            return None
+        # The access time only feeds TTL and LRU eviction, so it needn't be
+        # written on every read
+        if now - row[1] > TOUCH_INTERVAL:
+            with conn:
+                conn.execute('UPDATE sessions SET accessed = ? WHERE sid = ?', (now, sid))
+        return json.loads(row[0])
+
+    def _store(self, sid, payload, now):
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO sessions (sid, data, accessed, size) VALUES (?, ?, ?, ?)',
+                (sid, payload, now, len(payload))
+            )
+
+    def _remove(self, sid):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM sessions WHERE sid = ?', (sid,))
+
+    def _collect(self, now):
+        conn = self._connect()
+        with conn:
+            expired = conn.execute('DELETE FROM sessions WHERE accessed < ?', (now - self.ttl,)).rowcount
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM sessions').fetchone()[0]
+        evicted = 0
+        if total > self.max_bytes:
+            victims = []
+            for sid, size in conn.execute('SELECT sid, size FROM sessions ORDER BY accessed'):
+                if total <= self.max_bytes:
+                    break
+                victims.append((sid,))
+                total -= size
+            with conn:
+                conn.executemany('DELETE FROM sessions WHERE sid = ?', victims)
+            evicted = len(victims)
+        return expired, evicted
+
+    def size(self):
+        entries, total = self._connect().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM sessions'
+        ).fetchone()
+        return {'entries': entries, 'bytes': total}
+
+
+class FilesystemSessionBackend(SessionBackend):
+    """One JSON file per session; the file's mtime doubles as last access."""
+
+    def __init__(self, directory, **kwargs):
+        super().__init__(**kwargs)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, sid):
+        return os.path.join(self.directory, sid + '.json')
+
+    def _load(self, sid, now):
+        path = self._path(sid)
+        try:
+            accessed = os.path.getmtime(path)
+            if accessed + self.ttl < now:
+                self._remove(sid)
+                return None
+            with open(path, 'rb') as f:
+                data = json.loads(f.read())
+            if now - accessed > TOUCH_INTERVAL:
+                os.utime(path, (now, now))
+            return data
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, sid, payload, now):
+        # Write-then-rename so a concurrent reader never sees a partial file.
+        path = self._path(sid)
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp, path)
+
+    def _remove(self, sid):
+        try:
+            os.remove(self._path(sid))
+        except OSError:
+            pass
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json'):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.name[:-len('.json')]))
+        return entries
+
+    def _collect(self, now):
+        expired = evicted = 0
+        live = []
+        for mtime, size, sid in self._entries():
+            if mtime + self.ttl < now:
+                self._remove(sid)
+                expired += 1
+            else:
+                live.append((mtime, size, sid))
+        total = sum(size for _, size, _ in live)
+        for mtime, size, sid in sorted(live):
+            if total <= self.max_bytes:
+                break
+            self._remove(sid)
+            total -= size
+            evicted += 1
+        return expired, evicted
+
+    def size(self):
+        entries = self._entries()
+        return {'entries': len(entries), 'bytes': sum(size for _, size, _ in entries)}
+
+
+class ServerSideSessionInterface(SessionInterface):
+    def __init__(self, backend, salt='server-side-session'):
+        self.backend = backend
+        self.salt = salt
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt=self.salt)
+
+    def open_session(self, app, request):
+        cookie = request.cookies.get(app.session_cookie_name)
+        if cookie:
+            try:
+                sid = self._signer(app).unsign(cookie).decode('ascii')
+            except BadSignature:
+                sid = None
+            if sid:
+                data = self.backend.get(sid)
+                if data is not None:
+                    return ServerSideSession(data, sid=sid)
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if not session:
+            if session.modified and not session.new:
+                self.backend.delete(session.sid)
+                response.delete_cookie(app.session_cookie_name, domain=domain, path=path)
+            return
+        if not (session.modified or session.new or self.should_set_cookie(app, session)):
+            return
+        if session.modified or session.new:
+            self.backend.set(session.sid, dict(session))
+        response.set_cookie(
+            app.session_cookie_name,
+            self._signer(app).sign(session.sid.encode('ascii')).decode('ascii'),
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+
+
+def init_app(app):
+    """Install the backend selected by ``SESSION_BACKEND`` (sqlite, filesystem or cookie)."""
+    kind = os.getenv('SESSION_BACKEND', 'sqlite').lower()
+    if kind == 'cookie':
+        return None
+    options = {
+        'ttl': int(os.getenv('SESSION_TTL', 86400)),
+        'max_bytes': int(os.getenv('SESSION_MAX_BYTES', 64 * 1024 * 1024)),
+        'gc_interval': int(os.getenv('SESSION_GC_INTERVAL', 60)),
+    }
+    os.makedirs(app.instance_path, exist_ok=True)
+    if kind == 'filesystem':
+        directory = os.getenv('SESSION_DIR', os.path.join(app.instance_path, 'sessions'))
+        backend = FilesystemSessionBackend(directory, **options)
+    elif kind == 'sqlite':
+        path = os.getenv('SESSION_DB', os.path.join(app.instance_path, 'sessions.sqlite3'))
+        backend = SQLiteSessionBackend(path, **options)
+    else:
+        raise RuntimeError(f'Unknown SESSION_BACKEND: {kind}')
+    app.session_interface = ServerSideSessionInterface(backend)
+    return backend
@@ -0,0 +1,268 @@
+"""Request coalescing for identical in-flight calls.
+
+``SingleFlight`` makes concurrent callers in one worker share a single call
+per key. With a ``SQLiteLease`` attached, the caller that wins in each worker
+also competes for a lease in a SQLite file, so only one worker on the host
+does the upstream request and the others read its outcome. Streamed calls
+(``stream``) are shared the same way: the leader's caller gets the chunks
+as they arrive, everyone else the finished text in one chunk.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+
+class SingleFlightError(RuntimeError):
+    """Error raised by another worker's call, re-raised for its waiters, or
+    raised when the caller's timeout passes before the call finishes."""
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, lease=None):
+        self.lease = lease
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.counters = {'leaders': 0, 'coalesced': 0}
+
+    def _join(self, key):
+        # The caller's call for key, and whether it leads it
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.counters['coalesced'] += 1
+                return call, False
+            call = self._calls[key] = _Call()
+            self.counters['leaders'] += 1
+            return call, True
+
+    def _release(self, key, call):
+        with self._lock:
+            del self._calls[key]
+        call.done.set()
+
+    def _wait(self, call, timeout):
+        if not call.done.wait(timeout):
+            raise SingleFlightError('Timed out waiting for the same request')
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def do(self, key, fn, *args, timeout=None):
+        """Return ``fn(*args)``, shared with concurrent callers of ``key``.
+
+        Waiters give up with ``SingleFlightError`` after ``timeout`` seconds.
+        """
+        call, leader = self._join(key)
+        if not leader:
+            return self._wait(call, timeout)
+        try:
+            if self.lease is not None:
+                call.result = self.lease.do(key, fn, *args, timeout=timeout)
+            else:
+                call.result = fn(*args)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            self._release(key, call)
+        return call.result
+
+    def stream(self, key, fn, *args, timeout=None):
+        """Yield the text chunks of generator ``fn(*args)``, shared like ``do``.
+
+        Waiters (streamed or not) get the joined text once the leader's
+        caller has read every chunk; if it stops early, they get a
+        ``SingleFlightError``.
+        """
+        call, leader = self._join(key)
+        if not leader:
+            yield self._wait(call, timeout)
+            return
+        try:
+            if self.lease is not None:
+                chunks = self.lease.stream(key, fn, *args, timeout=timeout)
+            else:
+                chunks = fn(*args)
+            parts = []
+            for text in chunks:
+                parts.append(text)
+                yield text
+            call.result = ''.join(parts)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            if call.result is None and call.error is None:
+                call.error = SingleFlightError('The same request was cancelled')
+            self._release(key, call)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['in_flight'] = len(self._calls)
+        if self.lease is not None:
+            stats['lease'] = self.lease.stats()
+        return stats
+
+
+class SQLiteLease:
+    """Cross-worker leader election through a row per key in SQLite.
+
+    The leader's outcome (JSON result or error message) stays readable for
+    ``retention`` seconds so that waiting workers can pick it up. A lease
+    older than ``ttl`` is assumed to belong to a dead worker and is taken over.
+    """
+
+    def __init__(self, path, ttl=120, retention=30, poll_interval=0.1):
+        self.path = path
+        self.ttl = ttl
+        self.retention = retention
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.counters = {'leases': 0, 'coalesced': 0, 'takeovers': 0}
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS flights ('
+                ' key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL,'
+                ' done INTEGER NOT NULL DEFAULT 0, finished REAL, result TEXT, error TEXT)'
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _acquire(self, conn, key, owner, retry_failed=False):
+        now = time.time()
+        conn.execute('DELETE FROM flights WHERE done = 1 AND finished < ?', (now - self.retention,))
+        if retry_failed:
+            conn.execute('DELETE FROM flights WHERE key = ? AND done = 1 AND error IS NOT NULL', (key,))
+        inserted = conn.execute(
+            'INSERT OR IGNORE INTO flights (key, owner, expires) VALUES (?, ?, ?)',
+            (key, owner, now + self.ttl)
+        ).rowcount
+        if inserted:
+            return True
+        taken = conn.execute(
+            'UPDATE flights SET owner = ?, expires = ? WHERE key = ? AND done = 0 AND expires < ?',
+            (owner, now + self.ttl, key, now)
+        ).rowcount
+        if taken:
+            self._count('takeovers')
+        return bool(taken)
+
+    def _wait(self, conn, key, owner, timeout):
+        # (True, None) once owner holds the lease, or (False, result) of
+        # the holder. Polls with reads only; the lease is written to just
+        # when it looks free.
+        deadline = time.time() + (self.ttl if timeout is None else timeout)
+        counted = False
+        while True:
+            now = time.time()
+            row = conn.execute('SELECT done, finished, result, error, expires FROM flights WHERE key = ?',
+                               (key,)).fetchone()
+            retry_failed = False
+            if row is not None and row[0] and row[1] >= now - self.retention:
+                if row[3] is None:
+                    return False, json.loads(row[2])
+                if counted:
+                    raise SingleFlightError(row[3])
+                # A failure we never waited for: clear it and retry the call
+                retry_failed = True
+            if row is None or row[0] or row[4] < now:
+                try:
+                    if self._acquire(conn, key, owner, retry_failed):
+                        self._count('leases')
+                        return True, None
+                except sqlite3.OperationalError:
+                    # Locked by another writer, most likely taking the same lease
+                    pass
+            if now >= deadline:
+                raise SingleFlightError('Timed out waiting for the same request in another worker')
+            if not counted:
+                self._count('coalesced')
+                counted = True
+            time.sleep(self.poll_interval)
+
+    def _finish(self, conn, key, owner, result=None, error=None):
+        if error is None:
+            conn.execute(
+                'UPDATE flights SET done = 1, finished = ?, result = ? WHERE key = ? AND owner = ?',
+                (time.time(), json.dumps(result), key, owner)
+            )
+        else:
+            conn.execute(
+                'UPDATE flights SET done = 1, finished = ?, error = ? WHERE key = ? AND owner = ?',
+                (time.time(), error, key, owner)
+            )
+
+    def do(self, key, fn, *args, timeout=None):
+        """Run ``fn(*args)`` under the lease for ``key``, or wait for the holder's outcome.
+
+        Raises ``SingleFlightError`` when the holder failed or ``timeout``
+        (default ``ttl``) seconds pass first.
+        """
+        conn = self._connect()
+        owner = uuid.uuid4().hex
+        leased, result = self._wait(conn, key, owner, timeout)
+        if not leased:
+            return result
+        try:
+            result = fn(*args)
+        except Exception as e:
+            self._finish(conn, key, owner, error=str(e))
+            raise
+        self._finish(conn, key, owner, result)
+        return result
+
+    def stream(self, key, fn, *args, timeout=None):
+        """Yield the chunks of generator ``fn(*args)`` under the lease, or the
+        holder's joined text as one chunk.
+
+        A caller that stops reading early gives the lease up, so a waiter
+        takes it over instead of failing.
+        """
+        conn = self._connect()
+        owner = uuid.uuid4().hex
+        leased, result = self._wait(conn, key, owner, timeout)
+        if not leased:
+            yield result
+            return
+        parts = []
+        finished = False
+        try:
+            for text in fn(*args):
+                parts.append(text)
+                yield text
+            finished = True
+        except Exception as e:
+            self._finish(conn, key, owner, error=str(e))
+            finished = True
+            raise
+        finally:
+            if not finished:
+                conn.execute('DELETE FROM flights WHERE key = ? AND owner = ?', (key, owner))
+        self._finish(conn, key, owner, ''.join(parts))
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters)
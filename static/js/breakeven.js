@@ -0,0 +1,52 @@
+// Break-even chart series from the compact model the server sends
+// (engine.break_even_model): revenue is price x units, costs are the fixed
+// costs plus total variable cost interpolated between the knots. Samples
+// are the model's round grid, the knots in range and the exact crossover,
+// thinned to the number of pixels available.
+
+function variableCost(model, units) {
+    const knots = model.knots;
+    let lo = 0;
+    let hi = knots.units.length - 1;
+    // Last knot at or below units
+    while (lo < hi) {
+        const mid = (lo + hi + 1) >> 1;
+        if (knots.units[mid] <= units) {
+            lo = mid;
+        } else {
+            hi = mid - 1;
+        }
+    }
+    const slope = lo + 1 < knots.units.length
+        ? (knots.costs[lo + 1] - knots.costs[lo]) / (knots.units[lo + 1] - knots.units[lo])
+        : model.unit_cost;
+    return knots.costs[lo] + slope * (units - knots.units[lo]);
+}
+
+function breakEvenSeries(model, points) {
+    const series = {labels: [], revenue: [], costs: []};
+    if (!model) {
+        return series;
+    }
+    const count = Math.round(model.end / model.step);
+    let units = [];
+    for (let i = 0; i <= count; i++) {
+        units.push(i * model.step);
+    }
+    units = units.concat(model.knots.units.filter(u => u > 0 && u < model.end), [model.break_even]);
+    units.sort((a, b) => a - b);
+    units = units.filter((u, i) => i === 0 || u !== units[i - 1]);
+
+    // Every stride-th sample, plus the ends and the crossover
+    const stride = Math.ceil(units.length / Math.max(points || units.length, 4));
+    units = units.filter((u, i) => i % stride === 0 || i === units.length - 1 || u === model.break_even);
+
+    // Units to a hundredth of the grid step, amounts to cents
+    const digits = Math.max(2, 2 - Math.floor(Math.log10(model.step)));
+    units.forEach(u => {
+        series.labels.push(Number(u.toFixed(digits)));
+        series.revenue.push(Math.round(u * model.price * 100) / 100);
+        series.costs.push(Math.round((model.fixed + variableCost(model, u)) * 100) / 100);
+    });
+    return series;
+}
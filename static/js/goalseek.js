@@ -0,0 +1,43 @@
+// Summary page goal seek: solve for one input at a target volume without
+// reloading the page.
+
+const GOAL_LABELS = {
+    price_range: 'a price of',
+    cost_of_goods: 'a unit cost of at most',
+    overhead_costs: 'monthly fixed costs of at most',
+    startup_costs: 'startup costs of at most'
+};
+
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('goalSeek');
+    if (!form) {
+        return;
+    }
+    const output = document.getElementById('goalSeekResult');
+    form.addEventListener('submit', function(event) {
+        event.preventDefault();
+        const goal = form.elements.solve_for.value;
+        const units = parseFloat(form.elements.units.value);
+        fetch(form.dataset.url, {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({solve_for: goal, units: units})
+        })
+            .then(response => response.json())
+            .then(data => {
+                if (data.error) {
+                    output.textContent = data.error;
+                    return;
+                }
+                const row = data.results[0];
+                const volume = units.toLocaleString();
+                if (!row.feasible) {
+                    output.textContent = `No ${goal === 'price_range' ? 'price' : 'value'} breaks even at ${volume} units per month with your other numbers.`;
+                    return;
+                }
+                const amount = row[goal].toLocaleString(undefined, {minimumFractionDigits: 2, maximumFractionDigits: 2});
+                output.textContent = `To break even at ${volume} units per month you need ${GOAL_LABELS[goal]} $${amount}.`;
+            })
+            .catch(error => console.error('Goal seek failed:', error));
+    });
+});
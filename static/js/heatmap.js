@@ -0,0 +1,183 @@
+// Price × cost break-even heatmap drawn from quantized server tiles.
+// Each tile is a little-endian Uint16Array of tile_size × tile_size codes
+// (rows by cost, columns by price); dragging only fetches tiles not seen yet.
+// Tile URLs carry a key for the session's inputs, so when the what-if
+// sliders change them the geometry is reloaded and the tiles start over.
+
+function heatmapColor(code, meta) {
+    if (code === meta.no_break_even) {
+        return [204, 204, 204];
+    }
+    // Green (few units needed) through yellow to red
+    const t = code / meta.levels;
+    if (t < 0.5) {
+        return [Math.round(510 * t), 180, 80];
+    }
+    return [255, Math.round(180 * (2 - 2 * t)), 80];
+}
+
+function decodeUnits(code, meta) {
+    if (code === meta.no_break_even) {
+        return Infinity;
+    }
+    return Math.expm1(code / meta.levels * Math.log1p(meta.max_units));
+}
+
+function initHeatmap(canvas, info, metaUrl) {
+    const ctx = canvas.getContext('2d');
+    const tiles = new Map();
+    const pending = new Set();
+    const failed = new Set();
+    const rejected = new Set();
+    let meta = null;
+    let reloading = false;
+    let originX = 0;
+    let originY = 0;
+    let drag = null;
+
+    function cellAt(x, y) {
+        // Column/row of the cell under canvas pixel (x, y); cost grows upwards
+        return [originX + x, originY + (canvas.height - 1 - y)];
+    }
+
+    function codeAt(i, j) {
+        const size = meta.tile_size;
+        const tx = Math.floor(i / size);
+        const ty = Math.floor(j / size);
+        const tile = tiles.get(tx + ',' + ty);
+        if (!tile) {
+            fetchTile(tx, ty);
+            return null;
+        }
+        return tile[(j - ty * size) * size + (i - tx * size)];
+    }
+
+    function fetchTile(tx, ty) {
+        const key = tx + ',' + ty;
+        const url = meta.tiles;
+        const path = url + '/' + tx + '/' + ty;
+        if (pending.has(path) || failed.has(key) || reloading) {
+            return;
+        }
+        pending.add(path);
+        fetch(path)
+            .then(response => response.ok ? response.arrayBuffer() : Promise.reject(response.status))
+            .then(buffer => {
+                if (url === meta.tiles) {
+                    tiles.set(key, new Uint16Array(buffer));
+                    draw();
+                }
+            })
+            .catch(error => {
+                if (url !== meta.tiles) {
+                    return;
+                }
+                if (error === 409 && !rejected.has(url)) {
+                    // The inputs changed under this key: fetch the new geometry once
+                    rejected.add(url);
+                    loadMeta();
+                } else {
+                    failed.add(key);
+                    console.error('Heatmap tile failed:', key, error);
+                }
+            })
+            .finally(() => pending.delete(path));
+    }
+
+    function draw() {
+        const image = ctx.createImageData(canvas.width, canvas.height);
+        for (let y = 0; y < canvas.height; y++) {
+            for (let x = 0; x < canvas.width; x++) {
+                const [i, j] = cellAt(x, y);
+                const code = codeAt(i, j);
+                const rgb = code === null ? [240, 240, 240] : heatmapColor(code, meta);
+                const offset = (y * canvas.width + x) * 4;
+                image.data[offset] = rgb[0];
+                image.data[offset + 1] = rgb[1];
+                image.data[offset + 2] = rgb[2];
+                image.data[offset + 3] = 255;
+            }
+        }
+        ctx.putImageData(image, 0, 0);
+        // Crosshair on the session's own price and cost
+        const cx = -originX;
+        const cy = canvas.height - 1 + originY;
+        ctx.strokeStyle = 'rgba(0, 0, 0, 0.6)';
+        ctx.beginPath();
+        ctx.moveTo(cx + 0.5, 0);
+        ctx.lineTo(cx + 0.5, canvas.height);
+        ctx.moveTo(0, cy + 0.5);
+        ctx.lineTo(canvas.width, cy + 0.5);
+        ctx.stroke();
+    }
+
+    function pixel(event) {
+        const rect = canvas.getBoundingClientRect();
+        return [
+            Math.floor((event.clientX - rect.left) * canvas.width / rect.width),
+            Math.floor((event.clientY - rect.top) * canvas.height / rect.height)
+        ];
+    }
+
+    function describe(event) {
+        const [i, j] = cellAt(...pixel(event));
+        const code = codeAt(i, j);
+        const price = Math.max(meta.price_origin + i * meta.price_step, 0);
+        const cost = Math.max(meta.cost_origin + j * meta.cost_step, 0);
+        let units = '…';
+        if (code !== null) {
+            const value = decodeUnits(code, meta);
+            units = !isFinite(value) ? 'never breaks even'
+                : (code >= meta.levels ? '≥ ' : '') + Math.round(value).toLocaleString() + ' units/month';
+        }
+        info.textContent = `Price $${price.toFixed(2)}, cost $${cost.toFixed(2)}: ${units}`;
+    }
+
+    canvas.addEventListener('mousedown', event => {
+        drag = {pixel: pixel(event), originX: originX, originY: originY};
+    });
+    window.addEventListener('mouseup', () => { drag = null; });
+    canvas.addEventListener('mousemove', event => {
+        if (drag) {
+            const [x, y] = pixel(event);
+            originX = drag.originX - (x - drag.pixel[0]);
+            originY = drag.originY + (y - drag.pixel[1]);
+            draw();
+        }
+        describe(event);
+    });
+
+    function loadMeta() {
+        if (reloading) {
+            return;
+        }
+        reloading = true;
+        fetch(metaUrl)
+            .then(response => response.ok ? response.json() : Promise.reject(response.status))
+            .then(data => {
+                if (meta === null) {
+                    originX = -data.cells / 2;
+                    originY = -data.cells / 2;
+                }
+                if (meta === null || data.tiles !== meta.tiles) {
+                    tiles.clear();
+                    failed.clear();
+                }
+                meta = data;
+                canvas.width = meta.cells;
+                canvas.height = meta.cells;
+            })
+            .catch(error => console.error('Heatmap failed:', error))
+            .finally(() => {
+                reloading = false;
+                if (meta) {
+                    draw();
+                }
+            });
+    }
+
+    // Slider changes (whatif.js) move the inputs the tiles were computed for
+    document.addEventListener('whatif:recomputed', loadMeta);
+
+    loadMeta();
+}
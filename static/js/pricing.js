@@ -0,0 +1,83 @@
+// Step 3 price optimizer: posts the demand curve to the optimizer API and
+// offers the best price next to the AI suggestion.
+
+function parseDemandPoints(text) {
+    return text.split('\n')
+        .map(line => line.split(/[,;\s]+/).filter(Boolean).map(Number))
+        .filter(pair => pair.length === 2 && pair.every(isFinite));
+}
+
+function renderPriceOptimum(container, result) {
+    const money = value => '$' + value.toLocaleString(undefined, {minimumFractionDigits: 2, maximumFractionDigits: 2});
+    const price = Math.round(result.price * 100) / 100;
+    container.innerHTML = '';
+    const block = document.createElement('div');
+    block.className = 'alert alert-success';
+    const summary = document.createElement('p');
+    summary.textContent = `Best price: ${money(price)}, selling about ${Math.round(result.volume).toLocaleString()} units ` +
+        `for ${money(result.profit)} profit per month. Break-even at this price: ` +
+        (result.break_even_units === null ? 'never' : `${Math.round(result.break_even_units).toLocaleString()} units per month`) + '.';
+    block.appendChild(summary);
+    if (result.at_limit) {
+        const note = document.createElement('p');
+        note.textContent = 'Profit was still rising at the top of the searched range; demand may be less price-sensitive than this curve suggests.';
+        block.appendChild(note);
+    }
+    const button = document.createElement('button');
+    button.type = 'button';
+    button.className = 'btn btn-sm btn-outline-primary use-suggestion-btn';
+    button.textContent = 'Use This Price';
+    button.addEventListener('click', () => useSuggestion(`FINAL SUGGESTION: $${price.toFixed(2)}`, 'price_range'));
+    block.appendChild(button);
+    container.appendChild(block);
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('priceOptimizer');
+    if (!form) {
+        return;
+    }
+    const result = document.getElementById('priceOptimizerResult');
+    const model = form.elements.model;
+
+    function showParams() {
+        form.querySelectorAll('.demand-param').forEach(el => {
+            el.hidden = !el.dataset.models.split(' ').includes(model.value);
+        });
+    }
+    model.addEventListener('change', showParams);
+    showParams();
+
+    // Start from the price already entered or suggested
+    const price = document.getElementById('price_range');
+    if (price && price.value && !form.elements.reference_price.value) {
+        form.elements.reference_price.value = price.value;
+    }
+
+    form.addEventListener('submit', function(event) {
+        event.preventDefault();
+        const body = {model: model.value};
+        ['variable_cost', 'reference_price', 'reference_volume', 'choke_price', 'elasticity'].forEach(name => {
+            body[name] = form.elements[name].value;
+        });
+        body.points = parseDemandPoints(form.elements.points.value);
+        fetch(form.dataset.url, {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify(body)
+        })
+            .then(response => response.json().then(data => ({ok: response.ok, data: data})))
+            .then(({ok, data}) => {
+                if (!ok) {
+                    result.innerHTML = '';
+                    const error = document.createElement('div');
+                    error.className = 'alert alert-danger';
+                    error.textContent = data.error;
+                    result.appendChild(error);
+                    return;
+                }
+                renderPriceOptimum(result, data);
+            })
+            .catch(error => console.error('Price optimizer failed:', error));
+    });
+});
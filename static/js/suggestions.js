@@ -34,3 +34,70 @@ function useSuggestion(suggestionText, inputId) {
         alert('Could not find the final suggestion amount. Please enter the value manually.');
     }
 }
+
+function renderSuggestionBlock(form) {
+    // Reuse the server-rendered block if there is one, otherwise build it
+    let block = form.parentNode.querySelector('.alert-info');
+    if (!block) {
+        block = document.createElement('div');
+        block.className = 'alert alert-info';
+        form.parentNode.insertBefore(block, form);
+    }
+    block.innerHTML = '<h4>AI Suggestion:</h4><p class="ai-suggestion-text streaming"></p>';
+    return block;
+}
+
+function streamSuggestion(form) {
+    const inputId = form.dataset.field;
+    const submit = form.querySelector('button[type="submit"]');
+    const block = renderSuggestionBlock(form);
+    const output = block.querySelector('.ai-suggestion-text');
+    const source = new EventSource(form.dataset.streamUrl);
+    let received = false;
+
+    submit.disabled = true;
+
+    source.onmessage = function(event) {
+        received = true;
+        output.textContent += JSON.parse(event.data).text;
+    };
+
+    source.addEventListener('done', function(event) {
+        source.close();
+        const suggestion = JSON.parse(event.data).text;
+        output.textContent = suggestion;
+        output.classList.remove('streaming');
+        const button = document.createElement('button');
+        button.type = 'button';
+        button.className = 'btn btn-sm btn-outline-primary use-suggestion-btn';
+        button.textContent = 'Use Suggestion';
+        button.addEventListener('click', () => useSuggestion(suggestion, inputId));
+        block.appendChild(button);
+        submit.disabled = false;
+    });
+
+    source.addEventListener('error', function(event) {
+        source.close();
+        submit.disabled = false;
+        if (event.data) {
+            output.textContent = JSON.parse(event.data).error;
+            output.classList.remove('streaming');
+        } else if (!received) {
+            // Connection failed before anything arrived: use the regular POST
+            console.log('Streaming unavailable, falling back to form submit');
+            form.submit();
+        }
+    });
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('form[data-stream-url]').forEach(function(form) {
+        form.addEventListener('submit', function(event) {
+            const input = document.getElementById(form.dataset.field);
+            if (input && !input.value) {
+                event.preventDefault();
+                streamSuggestion(form);
+            }
+        });
+    });
+});
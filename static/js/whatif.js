@@ -0,0 +1,66 @@
+// Summary page what-if sliders: each change is sent to the recompute API,
+// which saves it in the session and returns the new break-even, its message
+// and the chart model. Only one request is in flight; moves made meanwhile
+// are sent together.
+
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('whatIf');
+    if (!form) {
+        return;
+    }
+    const message = document.getElementById('breakEvenMessage');
+    const container = document.getElementById('breakEvenChartContainer');
+    const note = document.getElementById('whatIfNote');
+    let pending = {};
+    let inFlight = false;
+
+    function send() {
+        if (inFlight || Object.keys(pending).length === 0) {
+            return;
+        }
+        const body = JSON.stringify(pending);
+        pending = {};
+        inFlight = true;
+        fetch(form.dataset.url, {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: body
+        })
+            .then(response => response.json())
+            .then(data => {
+                if (data.error) {
+                    message.textContent = data.error;
+                    return;
+                }
+                message.textContent = data.message;
+                container.hidden = data.units === null;
+                const chart = Chart.getChart('breakEvenChart');
+                if (chart) {
+                    // The response carries the chart model (breakeven.js)
+                    const series = breakEvenSeries(data.chart, container.clientWidth);
+                    chart.data.labels = series.labels;
+                    chart.data.datasets[0].data = series.revenue;
+                    chart.data.datasets[1].data = series.costs;
+                    chart.update('none');
+                }
+                note.hidden = false;
+                // The heatmap (heatmap.js) reloads its geometry for the new inputs
+                document.dispatchEvent(new Event('whatif:recomputed'));
+            })
+            .catch(error => console.error('Recompute failed:', error))
+            .finally(() => {
+                inFlight = false;
+                send();
+            });
+    }
+
+    form.querySelectorAll('input[type="range"]').forEach(input => {
+        const label = form.querySelector(`label[for="${input.id}"] .whatif-value`);
+        input.addEventListener('input', function() {
+            const value = parseFloat(input.value);
+            label.textContent = '$' + value.toFixed(2);
+            pending[input.name] = value;
+            send();
+        });
+    });
+});
@@ -0,0 +1,173 @@
+// Single-page wizard: every step is rendered up front, and submitting one
+// PATCHes only the fields that changed to the step API instead of posting
+// the form and following a redirect. Validation errors are shown next to
+// their fields. Blank AI-assisted fields are handled by suggestions.js,
+// whose submit handler runs first.
+
+document.addEventListener('DOMContentLoaded', function() {
+    const wizard = document.getElementById('wizard');
+    if (!wizard) {
+        return;
+    }
+    let state = JSON.parse(wizard.dataset.state);
+    const sections = wizard.querySelectorAll('section[data-step]');
+
+    function show(step) {
+        sections.forEach(section => {
+            section.hidden = section.dataset.step !== String(step || 'done');
+        });
+        const section = wizard.querySelector(`section[data-step="${step}"]`);
+        if (section) {
+            prefill(section);
+        }
+        window.scrollTo(0, 0);
+    }
+
+    // Batched AI estimates from step 2 fill blank numbers, like the step pages
+    function prefill(section) {
+        const form = section.querySelector('form');
+        const estimate = form.dataset.field && state.estimates[form.dataset.field];
+        const input = estimate && document.getElementById(form.dataset.field);
+        if (!input || input.value || section.querySelector('.alert-info')) {
+            return;
+        }
+        input.value = estimate.value;
+        const block = document.createElement('div');
+        block.className = 'alert alert-info';
+        block.innerHTML = '<h4>AI Suggestion:</h4><p></p>';
+        block.querySelector('p').textContent = estimate.rationale;
+        section.insertBefore(block, form);
+    }
+
+    function fields(form) {
+        const values = {};
+        form.querySelectorAll('input[name], textarea[name]').forEach(input => {
+            if (input.name === 'discount_from' || input.name === 'discount_cost') {
+                return;
+            }
+            if (input.type === 'checkbox') {
+                values[input.name] = input.checked;
+            } else {
+                values[input.name] = input.value;
+            }
+        });
+        if (form.querySelector('[name="discount_from"]')) {
+            const costs = form.querySelectorAll('[name="discount_cost"]');
+            values.cogs_breaks = Array.from(form.querySelectorAll('[name="discount_from"]'), (input, i) => ({
+                from: input.value || null,
+                cost: costs[i].value || null
+            }));
+        }
+        return values;
+    }
+
+    // Only what differs from the saved data is sent
+    function changes(form) {
+        const changed = {};
+        Object.entries(fields(form)).forEach(([name, value]) => {
+            const saved = state.data[name];
+            if (name === 'estimate_all') {
+                if (value) {
+                    changed[name] = true;
+                }
+            } else if (name === 'cogs_breaks') {
+                const breaks = value.filter(b => b.from || b.cost);
+                if (JSON.stringify(breaks.map(b => [Number(b.from), Number(b.cost)]))
+                        !== JSON.stringify((saved || []).map(b => [b.from, b.cost]))) {
+                    changed[name] = breaks;
+                }
+            } else if (typeof saved === 'number' ? value === '' || Number(value) !== saved : value !== (saved || '')) {
+                // A cleared field is sent too, so the server can flag it
+                changed[name] = value;
+            }
+        });
+        return changed;
+    }
+
+    function showErrors(form, errors) {
+        form.querySelectorAll('.is-invalid').forEach(input => input.classList.remove('is-invalid'));
+        form.querySelectorAll('.invalid-feedback').forEach(feedback => {
+            feedback.textContent = '';
+            feedback.classList.remove('d-block');
+        });
+        Object.entries(errors).forEach(([name, message]) => {
+            const input = form.querySelector(`[name="${name}"]`);
+            const feedback = form.querySelector(`.invalid-feedback[data-field="${name}"]`)
+                || (input && input.parentNode.querySelector('.invalid-feedback'));
+            if (input) {
+                input.classList.add('is-invalid');
+            }
+            if (feedback) {
+                feedback.textContent = message;
+                feedback.classList.add('d-block');
+            }
+        });
+    }
+
+    function request(url, method, body) {
+        return fetch(url, {
+            method: method,
+            headers: {'Content-Type': 'application/json'},
+            body: body === undefined ? undefined : JSON.stringify(body)
+        }).then(response => response.json().then(data => ({status: response.status, data: data})));
+    }
+
+    sections.forEach(section => {
+        const form = section.querySelector('form');
+        if (form) {
+            form.addEventListener('submit', function(event) {
+                if (event.defaultPrevented) {
+                    return;
+                }
+                event.preventDefault();
+                const submit = form.querySelector('button[type="submit"]');
+                submit.disabled = true;
+                request(form.dataset.apiUrl, 'PATCH', changes(form))
+                    .then(({status, data}) => {
+                        if (status === 422) {
+                            showErrors(form, data.errors);
+                        } else if (data.error) {
+                            showErrors(form, {});
+                            alert(data.error);
+                            if (data.step) {
+                                show(data.step);
+                            }
+                        } else {
+                            showErrors(form, {});
+                            state = data;
+                            const step = Number(section.dataset.step);
+                            if (step === 6) {
+                                window.location = state.summary_url;
+                            } else {
+                                show(step + 1);
+                            }
+                        }
+                    })
+                    .catch(() => form.submit())
+                    .finally(() => {
+                        submit.disabled = false;
+                    });
+            });
+        }
+        section.querySelectorAll('[data-action="back"]').forEach(button => {
+            button.addEventListener('click', () => show(Number(section.dataset.step) - 1));
+        });
+        section.querySelectorAll('[data-action="restart"]').forEach(button => {
+            button.addEventListener('click', function() {
+                request(wizard.dataset.sessionUrl, 'DELETE').then(({data}) => {
+                    state = data;
+                    wizard.querySelectorAll('form').forEach(form => {
+                        form.reset();
+                        form.querySelectorAll('input:not([type="checkbox"]), textarea').forEach(input => {
+                            input.value = '';
+                        });
+                    });
+                    wizard.querySelectorAll('.alert-info').forEach(block => block.remove());
+                    show(1);
+                });
+            });
+        });
+    });
+
+    show(state.step);
+});
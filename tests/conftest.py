@@ -0,0 +1,25 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# app.py reads its configuration at import time
+_instance = tempfile.mkdtemp()
+os.environ.setdefault('FLASK_SECRET_KEY', 'test')
+os.environ.setdefault('SECRET_KEY', 'code')
+os.environ['AI_PREFETCH'] = '0'
+for _name in ('SESSION_DB', 'AI_CACHE_DB', 'AI_LEASE_DB'):
+    os.environ[_name] = os.path.join(_instance, f'{_name.lower()}.sqlite3')
+
+
+@pytest.fixture
+def client():
+    """Logged-in test client."""
+    import app
+    client = app.app.test_client()
+    client.post('/login', data={'access_code': 'code'})
+    return client
@@ -0,0 +1,67 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import app
+import cache
+from ai_client import AIClientError
+from cache import LRUCache, SQLiteCache, TieredCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    offset = SimpleNamespace(seconds=0)
+    monkeypatch.setattr(cache, 'time', SimpleNamespace(time=lambda: time.time() + offset.seconds))
+    return offset
+
+
+def test_key_ignores_prompt_whitespace():
+    assert app.ai_cache_key('Price for\n    candles ') == app.ai_cache_key('Price for candles')
+
+
+@pytest.mark.parametrize('name, value', [('AI_MODEL', 'other-model'), ('AI_PROMPT_VERSION', 99),
+                                         ('AI_SYSTEM_PROMPT', 'Be terse.')])
+def test_key_changes_with_model_version_and_system_prompt(monkeypatch, name, value):
+    before = app.ai_cache_key('Price for candles')
+    monkeypatch.setattr(app, name, value)
+    assert app.ai_cache_key('Price for candles') != before
+
+
+@pytest.mark.parametrize('make', [lambda tmp_path: LRUCache(ttl=60),
+                                  lambda tmp_path: SQLiteCache(str(tmp_path / 'cache.sqlite3'), ttl=60)])
+def test_entries_expire_after_ttl(tmp_path, clock, make):
+    store = make(tmp_path)
+    store.set('k', 'v')
+    clock.seconds = 59
+    assert store.get('k') == 'v'
+    clock.seconds = 61
+    assert store.get('k') is None
+
+
+def test_disk_hit_refills_memory(tmp_path):
+    disk = SQLiteCache(str(tmp_path / 'cache.sqlite3'))
+    disk.set('k', {'v': 1})
+    tiered = TieredCache(LRUCache(), disk)
+    assert tiered.get('k') == {'v': 1}
+    assert tiered.memory.get('k') == {'v': 1}
+
+
+def test_only_successful_suggestions_are_cached(monkeypatch):
+    replies = [AIClientError('AI request timed out'), {'content': 'FINAL SUGGESTION: $25.00'}]
+    calls = []
+
+    def chat(*args, **kwargs):
+        calls.append(1)
+        reply = replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    monkeypatch.setattr(app.ai_client, 'chat', chat)
+    prompt = 'Suggest a price for cached candles'
+    with pytest.raises(AIClientError):
+        app.get_ai_suggestion(prompt, timeout=5)
+    assert app.get_ai_suggestion(prompt, timeout=5) == 'FINAL SUGGESTION: $25.00'
+    assert app.get_ai_suggestion(prompt.replace(' ', '\n    '), timeout=5) == 'FINAL SUGGESTION: $25.00'
+    assert len(calls) == 2
@@ -0,0 +1,54 @@
+import os
+import time
+
+import httpx
+import pytest
+
+from ai_client import AIClient, AIClientError, CircuitOpenError
+
+
+def streaming_client(body):
+    client = AIClient('key', max_retries=0)
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    client._client = httpx.Client(base_url=client.base_url, transport=transport)
+    client._pid = os.getpid()
+    return client
+
+
+def test_stream_chat_yields_content():
+    client = streaming_client(b'data: {"choices": [{"delta": {"content": "4"}}]}\n'
+                              b'data: {"choices": [{"delta": {"content": "2"}}]}\n'
+                              b'data: [DONE]\n')
+    assert list(client.stream_chat([], 'model')) == ['4', '2']
+
+
+@pytest.mark.parametrize('chunk', [b'data: {not json', b'data: {"choices": []}', b'data: {"error": "x"}'])
+def test_stream_chat_raises_client_error_on_corrupt_chunk(chunk):
+    client = streaming_client(b'data: {"choices": [{"delta": {"content": "4"}}]}\n' + chunk + b'\n')
+    chunks = client.stream_chat([], 'model')
+    assert next(chunks) == '4'
+    with pytest.raises(AIClientError, match='Malformed'):
+        next(chunks)
+
+
+def failing_client(exc):
+    def handler(request):
+        raise exc
+    client = AIClient('key', max_retries=0)
+    client._client = httpx.Client(base_url=client.base_url, transport=httpx.MockTransport(handler))
+    client._pid = os.getpid()
+    return client
+
+
+@pytest.mark.parametrize('exc', [httpx.DecodingError('bad gzip'), httpx.TooManyRedirects('loop'),
+                                 RuntimeError('bug')])
+def test_half_open_trial_always_settles_the_breaker(exc):
+    client = failing_client(exc)
+    # Open long enough ago that the next call is the half-open trial
+    client.breaker.state = 'open'
+    client.breaker.opened_at = time.monotonic() - client.breaker.reset_timeout - 1
+    with pytest.raises((AIClientError, RuntimeError)) as raised:
+        client.chat([], 'model')
+    assert not isinstance(raised.value, CircuitOpenError)
+    assert client.breaker.state == 'open'
+    assert client.stats()['failures'] == 1
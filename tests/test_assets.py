@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+import assets
+
+
+def write(path, content=b'x'):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def test_build_fails_without_vendored_libraries(tmp_path):
+    write(str(tmp_path / 'style.css'))
+    with pytest.raises(FileNotFoundError, match='flask assets vendor'):
+        assets.build(str(tmp_path))
+    assert not (tmp_path / 'dist').exists()
+
+
+def test_build_fingerprints_vendored_libraries(tmp_path):
+    for name in assets.VENDOR:
+        write(str(tmp_path / name), b'/* library */')
+    manifest = assets.build(str(tmp_path))
+    for name in assets.VENDOR:
+        assert (tmp_path / 'dist' / manifest[name]).is_file()
+        assert (tmp_path / 'dist' / (manifest[name] + '.gz')).is_file()
+
+
+def test_build_command_reports_missing_libraries(monkeypatch, tmp_path):
+    import app
+    monkeypatch.setattr(app.app, 'static_folder', str(tmp_path))
+    result = app.app.test_cli_runner().invoke(args=['assets', 'build'])
+    assert result.exit_code == 1
+    assert 'Not vendored' in result.output
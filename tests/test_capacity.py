@@ -0,0 +1,46 @@
+import pytest
+
+from engine import capacity_break_even, staircase
+
+TIERS = [(100, 400), (100, 300)]
+
+
+def test_each_added_tier_can_break_even_again():
+    plan = capacity_break_even(10, 5, TIERS)
+    assert plan['capacity'] == 200
+    assert plan['break_even_points'] == pytest.approx([80, 140])
+    assert plan['profitable_ranges'] == [[80, 100], [140, 200]]
+
+
+def test_stretches_that_stay_profitable_across_a_tier_are_merged():
+    plan = capacity_break_even(10, 5, [(100, 100), (100, 50)])
+    assert plan['break_even_points'] == pytest.approx([20])
+    assert plan['profitable_ranges'] == [[20, 200]]
+
+
+@pytest.mark.parametrize('max_capacity, points, ranges', [
+    (150, [80, 140], [[80, 100], [140, 150]]),
+    (120, [80], [[80, 100]]),
+    (50, [], []),
+])
+def test_max_capacity_cuts_the_tiers(max_capacity, points, ranges):
+    plan = capacity_break_even(10, 5, TIERS, max_capacity=max_capacity)
+    assert plan['break_even_points'] == pytest.approx(points)
+    assert plan['profitable_ranges'] == ranges
+
+
+def test_startup_costs_are_amortized():
+    # 1,200 over 12 months adds 100 a month to every tier
+    plan = capacity_break_even(10, 5, TIERS, startup=1200)
+    assert plan['break_even_points'] == pytest.approx([100, 160])
+
+
+def test_no_margin_never_breaks_even():
+    plan = capacity_break_even(5, 5, TIERS)
+    assert plan['break_even_points'] == [] and plan['profitable_ranges'] == []
+
+
+def test_staircase_jumps_at_each_tier():
+    chart = staircase(10, 5, capacity_break_even(10, 5, TIERS)['segments'])
+    assert [p['y'] for p in chart['costs']] == [400, 900, 1200, 1700]
+    assert chart['revenue'][-1] == {'x': 200.0, 'y': 2000}
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from engine import break_even_model, cost_schedule, lttb, tiered_break_even, total_variable_cost
+
+
+def evaluate(model, units):
+    # Python port of breakEvenSeries' cost evaluation in static/js/breakeven.js
+    knots = np.array(model['knots']['units'])
+    costs = np.array(model['knots']['costs'])
+    i = np.searchsorted(knots, units, side='right') - 1
+    slope = (costs[i + 1] - costs[i]) / (knots[i + 1] - knots[i]) if i + 1 < len(knots) else model['unit_cost']
+    return model['fixed'] + costs[i] + slope * (units - knots[i])
+
+
+@pytest.mark.parametrize('breaks', [(), [(100, 4.0), (250, 3.0)]])
+def test_model_evaluates_to_exact_total_cost(breaks):
+    schedule = cost_schedule(5.0, breaks)
+    fixed = 1000.0
+    units = tiered_break_even(20.0, schedule, fixed)
+    model = break_even_model(20.0, 5.0, fixed, units, schedule if breaks else None)
+    assert model['break_even'] == pytest.approx(units)
+    samples = np.append(np.arange(0, model['end'] + model['step'], model['step']), [units, 100, 250])
+    for u in samples:
+        assert evaluate(model, u) == pytest.approx(fixed + total_variable_cost(u, schedule), abs=0.02)
+    # Revenue meets costs at the crossover
+    assert evaluate(model, units) == pytest.approx(units * model['price'], abs=0.02)
+
+
+def test_grid_step_is_round():
+    model = break_even_model(20.0, 5.0, 1000.0, 66.67)
+    assert model['step'] == 10 and model['end'] == 140
+
+
+def test_many_breakpoints_are_reduced_to_max_knots():
+    breaks = [(u, 5.0 - u / 1000) for u in range(10, 4000, 10)]
+    schedule = cost_schedule(5.0, breaks)
+    model = break_even_model(20.0, 5.0, 20000.0, tiered_break_even(20.0, schedule, 20000.0), schedule, max_knots=50)
+    assert len(model['knots']['units']) == 50
+
+
+def test_lttb_keeps_the_ends_and_the_peak():
+    x = np.arange(100.0)
+    y = np.where(x == 37, 100.0, 0.0)
+    keep = lttb(x, y, 10)
+    assert len(keep) == 10
+    assert {0, 37, 99} <= set(keep.tolist())
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from engine import break_even, cost_schedule, tiered_break_even, total_variable_cost
+
+SCHEDULE = cost_schedule(5.0, [(250, 3.0), (100, 4.0)])
+
+
+def brute_force(price, schedule, fixed):
+    # First hundredth of a unit at which revenue covers costs
+    units = np.arange(0, 100000) / 100
+    covered = price * units - total_variable_cost(units, schedule) >= fixed
+    return units[covered.argmax()] if covered.any() else np.inf
+
+
+def test_each_break_applies_beyond_its_threshold():
+    assert total_variable_cost(300, SCHEDULE) == pytest.approx(100 * 5 + 150 * 4 + 50 * 3)
+    assert total_variable_cost([0, 100, 250], SCHEDULE) == pytest.approx([0, 500, 1100])
+
+
+def test_without_breaks_it_matches_the_flat_formula():
+    assert tiered_break_even(20, cost_schedule(5.0), 1000, 1200) == pytest.approx(break_even(20, 5, 1000, 1200))
+
+
+@pytest.mark.parametrize('fixed', [400, 1450, 2000, 4000])
+def test_matches_brute_force(fixed):
+    assert tiered_break_even(20, SCHEDULE, fixed) == pytest.approx(brute_force(20, SCHEDULE, fixed), abs=0.01)
+
+
+def test_rising_unit_costs_take_the_first_covering_segment():
+    rising = cost_schedule(5.0, [(100, 8.0)])
+    assert tiered_break_even(10, rising, 400) == pytest.approx(80)
+    assert tiered_break_even(10, rising, 1000) == pytest.approx(350)
+
+
+def test_never_breaks_even_when_the_last_tier_costs_the_price():
+    assert tiered_break_even(4, cost_schedule(5.0, [(100, 4.0)]), 100) == np.inf
+
+
+def test_scenarios_are_solved_together():
+    prices = np.array([20.0, 10.0, 4.0])
+    fixed = np.array([2000.0, 400.0, 100.0])
+    base = np.array([5.0, 6.0, 5.0])
+    units = tiered_break_even(prices, SCHEDULE, fixed, base_cost=base)
+    for i in range(3):
+        schedule = cost_schedule(base[i], [(100, 4.0), (250, 3.0)])
+        assert units[i] == pytest.approx(tiered_break_even(prices[i], schedule, fixed[i]))
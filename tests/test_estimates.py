@@ -0,0 +1,38 @@
+import pytest
+
+import app
+from ai_client import AIClientError
+
+DATA = {'product_description': 'Candles', 'target_audience': 'Gift buyers', 'location': 'Online'}
+
+
+def reply(arguments):
+    def chat(*args, **kwargs):
+        if isinstance(arguments, Exception):
+            raise arguments
+        return {'function_call': {'arguments': arguments}}
+    return chat
+
+
+@pytest.mark.parametrize('arguments', [
+    AIClientError('AI request timed out'),
+    '{not json',
+    '{"price_range": {"value": 20}}',
+    '{"price_range": "twenty"}',
+])
+def test_estimates_fall_back_on_failure(monkeypatch, arguments):
+    monkeypatch.setattr(app.ai_client, 'chat', reply(arguments))
+    assert app.get_ai_estimates(dict(DATA, location=repr(arguments))) == {}
+
+
+@pytest.mark.parametrize('arguments', [AIClientError('AI request timed out'), '{"products": [{"name": "A"}]}'])
+def test_product_estimates_fall_back_on_failure(monkeypatch, arguments):
+    monkeypatch.setattr(app.ai_client, 'chat', reply(arguments))
+    products = [{'name': 'A', 'price': None, 'cost': None, 'mix': 1.0}]
+    assert app.get_ai_product_estimates(dict(DATA, location=repr(arguments)), products) == {}
+
+
+def test_unexpected_errors_are_not_swallowed(monkeypatch):
+    monkeypatch.setattr(app.ai_client, 'chat', reply(RuntimeError('bug')))
+    with pytest.raises(RuntimeError):
+        app.get_ai_estimates(DATA)
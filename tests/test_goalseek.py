@@ -0,0 +1,36 @@
+import pytest
+
+from engine import break_even, goal_seek
+
+
+def test_extra_fixed_cost_is_not_part_of_solved_overhead():
+    # 100 units at $20 - $5 leaves $1,500; $500 of it goes to marketing
+    assert goal_seek('fixed_cost', price=20, variable_cost=5, units=100, startup=0,
+                     extra_fixed_cost=500) == pytest.approx(1000)
+
+
+@pytest.mark.parametrize('goal', ['price', 'variable_cost', 'startup', 'units'])
+def test_extra_fixed_cost_round_trips(goal):
+    inputs = {'price': 20.0, 'variable_cost': 5.0, 'fixed_cost': 1000.0, 'startup': 1200.0}
+    inputs['units'] = break_even(20.0, 5.0, 1500.0, 1200.0)
+    expected = inputs.pop(goal)
+    assert goal_seek(goal, extra_fixed_cost=500, **inputs) == pytest.approx(expected)
+
+
+def test_api_keeps_marketing_out_of_overhead(client):
+    with client.session_transaction() as session:
+        session['data'] = {'price_range': 20, 'cost_of_goods': 5, 'overhead_costs': 15300,
+                           'marketing_budget': 500, 'startup_costs': 0, 'sales_volume': 1100}
+    solved = client.post('/api/goal-seek', json={'solve_for': 'overhead_costs'}).json['results'][0]
+    # 1,100 units x $15 margin = $16,500, less $500 marketing
+    assert solved['overhead_costs'] == pytest.approx(16000)
+    echoed = client.post('/api/goal-seek', json={'solve_for': 'units'}).json['results'][0]
+    assert echoed['overhead_costs'] == 15300
+    assert echoed['units'] == pytest.approx((15300 + 500) / 15)
+
+
+@pytest.mark.parametrize('body', [b'[1, 2]', b'"units"', b'{not json'])
+def test_api_rejects_non_object_body_with_json(client, body):
+    response = client.post('/api/goal-seek', data=body, content_type='application/json')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
@@ -0,0 +1,36 @@
+import pytest
+
+from engine import demand_curve
+
+
+def test_points_demand_interpolates():
+    demand, max_price = demand_curve('points', points=[[10, 100], [20, 50]])
+    assert max_price == 20
+    assert demand(15) == pytest.approx(75)
+
+
+@pytest.mark.parametrize('points', [[[10]], [[10, 100, 1], [20, 50]], 5, [['a', 1], [2, 3]], [[10, 'inf'], [20, 5]]])
+def test_points_demand_rejects_bad_shapes(points):
+    with pytest.raises(ValueError, match='Demand points must'):
+        demand_curve('points', points=points)
+
+
+def test_api_optimizes_price(client):
+    response = client.post('/api/optimize-price', json={
+        'model': 'linear', 'reference_price': 10, 'reference_volume': 100, 'choke_price': 20,
+        'variable_cost': 4})
+    assert response.status_code == 200
+    assert response.get_json()['price'] == pytest.approx(12, abs=0.01)
+
+
+@pytest.mark.parametrize('body', [b'[1, 2]', b'{not json'])
+def test_api_rejects_non_object_body_with_json(client, body):
+    response = client.post('/api/optimize-price', data=body, content_type='application/json')
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_api_explains_bad_points(client):
+    response = client.post('/api/optimize-price', json={'model': 'points', 'points': [[10], [20]]})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Demand points must be a list of [price, volume] number pairs'
@@ -0,0 +1,101 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask, session
+
+import session_store
+from session_store import FilesystemSessionBackend, ServerSideSessionInterface, SQLiteSessionBackend
+
+TTL = 3600
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Seconds added to the real time as seen by session_store
+    offset = SimpleNamespace(seconds=0)
+    monkeypatch.setattr(session_store, 'time', SimpleNamespace(time=lambda: time.time() + offset.seconds))
+    return offset
+
+
+@pytest.fixture(params=['sqlite', 'filesystem'])
+def make_backend(request, tmp_path):
+    def make(**options):
+        options = dict({'ttl': TTL, 'gc_interval': 0}, **options)
+        if request.param == 'sqlite':
+            return SQLiteSessionBackend(str(tmp_path / 'sessions.sqlite3'), **options)
+        return FilesystemSessionBackend(str(tmp_path / 'sessions'), **options)
+    return make
+
+
+def test_round_trip_and_counters(make_backend):
+    backend = make_backend()
+    backend.set('a', {'data': {'price_range': 20}})
+    assert backend.get('a') == {'data': {'price_range': 20}}
+    assert backend.get('missing') is None
+    stats = backend.stats()
+    assert (stats['hits'], stats['misses'], stats['writes']) == (1, 1, 1)
+    assert stats['hit_rate'] == 0.5
+    assert stats['entries'] == 1
+
+
+def test_sessions_expire_after_ttl(make_backend, clock):
+    backend = make_backend()
+    backend.set('a', {'n': 1})
+    backend.set('b', {'n': 2})
+    clock.seconds = TTL + 1
+    assert backend.get('a') is None
+    backend.gc()
+    assert backend.stats()['entries'] == 0
+    assert backend.stats()['expired'] == 1
+
+
+def test_least_recently_used_sessions_are_evicted(make_backend, clock):
+    size = len(b'{"n":1}')
+    backend = make_backend(max_bytes=2 * size, gc_interval=3600)
+    for sid in 'abc':
+        backend.set(sid, {'n': 1})
+    # A read refreshes the access time once it is older than TOUCH_INTERVAL
+    clock.seconds = session_store.TOUCH_INTERVAL + 1
+    assert backend.get('a') == {'n': 1}
+    backend.gc()
+    assert backend.get('a') == {'n': 1}
+    assert [backend.get(sid) for sid in 'bc'].count(None) == 1
+    assert backend.stats()['evicted'] == 1
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    backend = SQLiteSessionBackend(str(tmp_path / 'sessions.sqlite3'))
+    app.session_interface = ServerSideSessionInterface(backend)
+
+    @app.route('/set')
+    def set_value():
+        session['value'] = 42
+        return ''
+
+    @app.route('/get')
+    def get_value():
+        return str(session.get('value'))
+
+    app.backend = backend
+    return app
+
+
+def test_cookie_carries_only_a_signed_id(app):
+    client = app.test_client()
+    client.get('/set')
+    cookie = next(c for c in client.cookie_jar if c.name == 'session')
+    assert '42' not in cookie.value
+    assert client.get('/get').data == b'42'
+
+
+def test_tampered_session_id_is_rejected(app):
+    client = app.test_client()
+    client.get('/set')
+    sid = next(iter(app.backend._connect().execute('SELECT sid FROM sessions')))[0]
+    # The stored ID without a valid signature starts a fresh session
+    client.set_cookie('localhost', 'session', sid + '.forged')
+    assert client.get('/get').data == b'None'
@@ -0,0 +1,126 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight, SingleFlightError, SQLiteLease
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'leases.sqlite3')
+
+
+def hold_lease(lease, key, release):
+    # Leader in another "worker" that finishes once release is set
+    thread = threading.Thread(target=lease.do, args=(key, lambda: release.wait(5) and 'answer'))
+    thread.start()
+    while lease.stats()['leases'] == 0:
+        time.sleep(0.01)
+    return thread
+
+
+def test_waiter_in_another_worker_gets_the_result(path):
+    release = threading.Event()
+    leader = hold_lease(SQLiteLease(path), 'k', release)
+    threading.Timer(0.2, release.set).start()
+    calls = []
+    assert SQLiteLease(path, poll_interval=0.01).do('k', calls.append, 'x', timeout=5) == 'answer'
+    assert calls == []
+    leader.join()
+
+
+def test_waiter_gives_up_at_its_own_deadline(path):
+    release = threading.Event()
+    leader = hold_lease(SQLiteLease(path, ttl=120), 'k', release)
+    started = time.monotonic()
+    with pytest.raises(SingleFlightError, match='Timed out'):
+        SQLiteLease(path, poll_interval=0.01).do('k', lambda: 'mine', timeout=0.2)
+    assert time.monotonic() - started < 2
+    release.set()
+    leader.join()
+
+
+def test_waiting_does_not_need_the_write_lock(path):
+    release = threading.Event()
+    leader = hold_lease(SQLiteLease(path), 'k', release)
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute('BEGIN IMMEDIATE')
+    try:
+        with pytest.raises(SingleFlightError, match='Timed out'):
+            SQLiteLease(path, poll_interval=0.01).do('k', lambda: 'mine', timeout=0.2)
+    finally:
+        blocker.execute('ROLLBACK')
+        release.set()
+        leader.join()
+
+
+def test_expired_lease_is_taken_over(path):
+    lease = SQLiteLease(path, ttl=0.05)
+    release = threading.Event()
+    leader = hold_lease(lease, 'k', release)
+    time.sleep(0.1)
+    other = SQLiteLease(path, poll_interval=0.01)
+    assert other.do('k', lambda: 'mine', timeout=5) == 'mine'
+    assert other.stats()['takeovers'] == 1
+    release.set()
+    leader.join()
+
+
+def test_in_process_waiter_times_out():
+    flight = SingleFlight()
+    release = threading.Event()
+    leader = threading.Thread(target=flight.do, args=('k', release.wait, 5))
+    leader.start()
+    while flight.stats()['in_flight'] == 0:
+        time.sleep(0.01)
+    with pytest.raises(SingleFlightError):
+        flight.do('k', lambda: 'mine', timeout=0.1)
+    release.set()
+    leader.join()
+
+
+def slow_chunks(release, calls):
+    calls.append(1)
+    yield 'Fif'
+    release.wait(5)
+    yield 'teen'
+
+
+def test_stream_waiter_gets_the_leaders_text_in_one_chunk():
+    flight = SingleFlight()
+    release, calls = threading.Event(), []
+    leader = flight.stream('k', slow_chunks, release, calls)
+    assert next(leader) == 'Fif'
+    waited = []
+    waiter = threading.Thread(target=lambda: waited.extend(flight.stream('k', slow_chunks, release, calls)))
+    waiter.start()
+    release.set()
+    assert list(leader) == ['teen']
+    waiter.join()
+    assert waited == ['Fifteen'] and calls == [1]
+
+
+def test_stream_waiter_in_another_worker_gets_the_text(path):
+    release, calls = threading.Event(), []
+    leader = threading.Thread(target=lambda: list(SQLiteLease(path).stream('k', slow_chunks, release, calls)))
+    leader.start()
+    while not calls:
+        time.sleep(0.01)
+    threading.Timer(0.1, release.set).start()
+    other = SQLiteLease(path, poll_interval=0.01)
+    assert list(other.stream('k', slow_chunks, release, calls, timeout=5)) == ['Fifteen']
+    assert calls == [1]
+    leader.join()
+
+
+def test_cancelled_stream_gives_the_lease_up(path):
+    release, calls = threading.Event(), []
+    leader = SQLiteLease(path).stream('k', slow_chunks, release, calls)
+    next(leader)
+    leader.close()
+    release.set()
+    other = SQLiteLease(path, poll_interval=0.01)
+    assert list(other.stream('k', slow_chunks, release, calls, timeout=1)) == ['Fif', 'teen']
+    assert calls == [1, 1]
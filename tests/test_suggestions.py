@@ -0,0 +1,29 @@
+import threading
+
+import app
+
+
+def test_concurrent_streams_share_one_upstream_call(monkeypatch):
+    release, calls = threading.Event(), []
+
+    def stream_chat(*args, **kwargs):
+        calls.append(1)
+        yield 'FINAL SUGGESTION: '
+        release.wait(5)
+        yield '$25.00'
+
+    monkeypatch.setattr(app.ai_client, 'stream_chat', stream_chat)
+    prompt = 'Suggest a price for coalesced candles'
+    leader = app.get_ai_suggestion(prompt, timeout=5, stream=True)
+    assert next(leader) == 'FINAL SUGGESTION: '
+    results = []
+    waiters = [threading.Thread(target=lambda: results.append(''.join(app.get_ai_suggestion(prompt, 5, stream=True))))
+               for _ in range(3)]
+    for waiter in waiters:
+        waiter.start()
+    release.set()
+    assert list(leader) == ['$25.00']
+    for waiter in waiters:
+        waiter.join()
+    assert results == ['FINAL SUGGESTION: $25.00'] * 3
+    assert calls == [1]
@@ -0,0 +1,71 @@
+def test_goal_seek_script_loads_without_a_break_even(client):
+    # Price below unit cost: no chart, but goal seek is what the user needs
+    with client.session_transaction() as session:
+        session['data'] = {'price_range': 4, 'cost_of_goods': 5, 'overhead_costs': 1000,
+                           'startup_costs': 0, 'sales_volume': 0}
+    page = client.get('/summary').data.decode()
+    assert 'id="goalSeek"' in page
+    assert 'js/goalseek' in page
+
+
+def test_chart_scripts_load_with_a_break_even(client):
+    with client.session_transaction() as session:
+        session['data'] = {'price_range': 20, 'cost_of_goods': 5, 'overhead_costs': 1000,
+                           'startup_costs': 1200, 'sales_volume': 0}
+    page = client.get('/summary').data.decode()
+    assert "getElementById('tornadoChart')" in page
+    assert 'initHeatmap(' in page
+
+
+def test_chart_scripts_skipped_without_a_break_even(client):
+    with client.session_transaction() as session:
+        session['data'] = {'price_range': 4, 'cost_of_goods': 5, 'overhead_costs': 1000,
+                           'startup_costs': 0, 'sales_volume': 0}
+    page = client.get('/summary').data.decode()
+    assert "getElementById('tornadoChart')" not in page
+    assert 'initHeatmap(' not in page
+
+
+def set_data(client, **changes):
+    with client.session_transaction() as session:
+        session['data'] = dict({'price_range': 20, 'cost_of_goods': 5, 'overhead_costs': 1000,
+                                'startup_costs': 1200, 'sales_volume': 0}, **changes)
+
+
+def test_summary_answers_conditional_requests(client):
+    set_data(client)
+    first = client.get('/summary')
+    etag = first.headers['ETag']
+    assert first.status_code == 200
+    assert 'no-cache' in first.headers['Cache-Control'] and 'private' in first.headers['Cache-Control']
+    again = client.get('/summary', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.data == b''
+
+
+def test_summary_is_rendered_once_per_inputs(client):
+    import app
+    set_data(client, overhead_costs=1234)
+    hits = app.summary_cache.hits
+    first = client.get('/summary')
+    second = client.get('/summary')
+    assert second.data == first.data
+    assert app.summary_cache.hits == hits + 1
+
+
+def test_summary_etag_follows_inputs_and_query(client):
+    set_data(client)
+    etag = client.get('/summary').headers['ETag']
+    assert client.get('/summary?spread=30').headers['ETag'] != etag
+    set_data(client, price_range=21)
+    changed = client.get('/summary', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+
+def test_fixed_cost_total_includes_the_marketing_budget(client):
+    set_data(client, marketing_budget=500)
+    page = client.get('/summary').data.decode()
+    assert 'Monthly Marketing Budget:</th>\n                    <td>$500.00' in page
+    # 1,000 overhead + 500 marketing + 1,200 / 12 startup
+    assert '$1600.00 (including amortized startup costs and marketing)' in page
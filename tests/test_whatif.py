@@ -0,0 +1,41 @@
+import pytest
+
+DATA = {'price_range': 20.0, 'cost_of_goods': 5.0, 'overhead_costs': 1000.0, 'startup_costs': 1200.0,
+        'products': [], 'ai_suggestions': {}}
+
+
+@pytest.fixture
+def summary_client(client):
+    with client.session_transaction() as session:
+        session['data'] = dict(DATA)
+    return client
+
+
+def test_recompute_returns_new_break_even(summary_client):
+    body = summary_client.post('/api/recompute', json={'price_range': 25}).get_json()
+    assert body['units'] == pytest.approx(1100 / 20, abs=0.01)
+
+
+@pytest.mark.parametrize('value', ['NaN', 'inf', '-inf'])
+def test_recompute_rejects_non_finite_values(summary_client, value):
+    response = summary_client.post('/api/recompute', json={'price_range': value})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Values must be finite numbers'
+    with summary_client.session_transaction() as session:
+        assert session['data']['price_range'] == 20.0
+
+
+def test_recompute_rejects_non_object_body(summary_client):
+    response = summary_client.post('/api/recompute', json=[1, 2])
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_recompute_returns_the_servers_message(summary_client):
+    with summary_client.session_transaction() as session:
+        session['data'] = dict(DATA, cogs_breaks=[{'from': 100.0, 'cost': 4.0}])
+    body = summary_client.post('/api/recompute', json={'price_range': 25}).get_json()
+    assert body['message'].endswith('and your volume discounts).')
+    body = summary_client.post('/api/recompute', json={'price_range': 3}).get_json()
+    assert body['units'] is None
+    assert body['message'].endswith('(at your largest volume discount)')
@@ -0,0 +1,97 @@
+import pytest
+
+FILLED = {'product_description': 'Candles', 'target_audience': 'Gift buyers', 'location': 'Online',
+          'price_range': 20.0, 'cost_of_goods': 5.0, 'overhead_costs': 1000.0}
+
+
+@pytest.fixture
+def at_step6(client):
+    with client.session_transaction() as session:
+        session['data'] = dict(FILLED, startup_costs=0, ai_suggestions={})
+    return client
+
+
+def test_zero_startup_costs_complete_the_wizard(at_step6):
+    state = at_step6.patch('/api/v1/steps/6', json={'startup_costs': 0}).get_json()
+    assert state['complete'] and state['step'] is None
+    assert at_step6.patch('/api/v1/steps/6', json={}).status_code == 200
+    assert at_step6.get('/api/v1/session').get_json()['complete']
+
+
+def test_unsubmitted_startup_costs_keep_step6_open(at_step6):
+    assert at_step6.get('/api/v1/session').get_json()['step'] == 6
+    response = at_step6.patch('/api/v1/steps/6', json={})
+    assert response.status_code == 422
+    assert 'startup_costs' in response.get_json()['errors']
+
+
+@pytest.mark.parametrize('value', ['NaN', 'inf', '-Infinity'])
+def test_non_finite_numbers_are_rejected(at_step6, value):
+    response = at_step6.patch('/api/v1/steps/6', json={'startup_costs': value})
+    assert response.status_code == 422
+    assert response.get_json()['errors'] == {'startup_costs': 'Please enter a finite number'}
+
+
+def test_non_finite_discounts_are_rejected(at_step6):
+    response = at_step6.patch('/api/v1/steps/4', json={'cogs_breaks': [{'from': 'inf', 'cost': 4}]})
+    assert response.status_code == 422
+    assert 'cogs_breaks' in response.get_json()['errors']
+
+
+@pytest.fixture
+def fresh(client):
+    client.delete('/api/v1/session')
+    return client
+
+
+def test_new_session_starts_at_step1(fresh):
+    state = fresh.get('/api/v1/session').get_json()
+    assert state['version'] == 1 and state['step'] == 1 and not state['complete']
+
+
+def test_later_steps_need_the_earlier_ones(fresh):
+    response = fresh.patch('/api/v1/steps/3', json={'price_range': 20})
+    assert response.status_code == 409
+    assert response.get_json()['step'] == 1
+    assert fresh.get('/api/v1/steps/3').status_code == 409
+
+
+def test_unknown_step_is_a_404(fresh):
+    assert fresh.get('/api/v1/steps/7').status_code == 404
+
+
+@pytest.mark.parametrize('step, changes, field, message', [
+    (1, {'product_description': '  '}, 'product_description', 'Please fill in this field'),
+    (1, {'price_range': 20}, 'price_range', 'Not a field of step 1'),
+    (3, {'price_range': 'twenty'}, 'price_range', 'Please enter a number'),
+    (3, {'price_range': 0}, 'price_range', 'Must be greater than zero'),
+    (6, {'startup_costs': -1}, 'startup_costs', 'Must not be negative'),
+    (4, {'cogs_breaks': [{'from': 100}]}, 'cogs_breaks', 'Please enter both a volume and a unit cost for each discount'),
+    (4, {'cogs_breaks': 'lots'}, 'cogs_breaks', 'Discounts must be a list of {from, cost} objects'),
+])
+def test_invalid_fields_are_a_422(at_step6, step, changes, field, message):
+    response = at_step6.patch(f'/api/v1/steps/{step}', json=changes)
+    assert response.status_code == 422
+    assert response.get_json()['errors'][field] == message
+
+
+def test_non_object_body_is_a_400(fresh):
+    assert fresh.patch('/api/v1/steps/1', json=['Candles']).status_code == 400
+
+
+def test_patch_saves_only_what_changed(at_step6):
+    state = at_step6.patch('/api/v1/steps/4', json={'cogs_breaks': [{'from': 100, 'cost': 4}]}).get_json()
+    assert state['updated'] == ['cogs_breaks']
+    assert state['data']['cost_of_goods'] == 5.0
+    assert state['data']['cogs_breaks'] == [{'from': 100.0, 'cost': 4.0}]
+
+
+def test_walking_the_steps_completes_the_wizard(fresh):
+    for step, changes in [(1, {'product_description': 'Candles'}),
+                          (2, {'target_audience': 'Gift buyers', 'location': 'Online'}),
+                          (3, {'price_range': '20'}), (4, {'cost_of_goods': 5}),
+                          (5, {'overhead_costs': 1000}), (6, {'startup_costs': 1200})]:
+        response = fresh.patch(f'/api/v1/steps/{step}', json=changes)
+        assert response.status_code == 200, response.get_json()
+        assert response.get_json()['step'] == (step + 1 if step < 6 else None)
+    assert fresh.get('/api/v1/session').get_json()['complete']